@@ -0,0 +1,125 @@
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import itertools
+import logging
+import re
+import numpy as np
+from .ranking import platform_engagement
+
+class Deduplicator:
+    """Cluster near-duplicate items across sources and merge each cluster into one."""
+    
+    HASH_BITS = 64
+    
+    def __init__(self, config: Dict[str, Any], canonicalize: Optional[Callable[[str], str]] = None):
+        """
+        Initialize the deduplicator.
+        
+        Args:
+            config: Settings (max_distance, hash_blocks, shingle_size, max_text_length)
+            canonicalize: Function mapping a URL to its canonical form
+        """
+        self.config = config
+        self.canonicalize = canonicalize or (lambda url: url.strip().lower().rstrip("/"))
+        self.max_distance = config.get("max_distance", 8)
+        self.shingle_size = config.get("shingle_size", 3)
+        self.logger = logging.getLogger(__name__)
+        
+        # Pigeonhole: two hashes within max_distance bits differ in at most
+        # max_distance of the blocks, so they agree exactly on some combination of
+        # the other blocks. One table per combination keeps buckets narrow.
+        blocks = max(config.get("hash_blocks", self.max_distance + 2), self.max_distance + 1)
+        bounds = [self.HASH_BITS * i // blocks for i in range(blocks + 1)]
+        block_masks = [((1 << (end - start)) - 1) << start for start, end in zip(bounds, bounds[1:])]
+        self.table_masks = [
+            sum(block_masks[i] for i in combination)
+            for combination in itertools.combinations(range(blocks), blocks - self.max_distance)
+        ]
+        self.reset()
+        
+    def reset(self) -> None:
+        """Forget the representatives indexed by add()."""
+        self._representatives: List[Dict[str, Any]] = []
+        self._fingerprints: List[int] = []
+        self._url_index: Dict[str, int] = {}
+        self._buckets: Dict[tuple, List[int]] = {}
+        
+    def fingerprint(self, item: Dict[str, Any]) -> int:
+        """64-bit SimHash over the item's title and text shingles."""
+        text = f"{item.get('title', '')} {item.get('text', '')}"[:self.config.get("max_text_length", 5000)]
+        tokens = re.findall(r"\w+", text.lower())
+        size = self.shingle_size if len(tokens) >= self.shingle_size else 1
+        shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        
+        digests = b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles)
+        # One row of bits per shingle, most significant first; a bit is set when most shingles set it
+        bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, self.HASH_BITS)
+        majority = 2 * bits.sum(axis=0, dtype=np.int64) > len(shingles)
+        return int.from_bytes(np.packbits(majority).tobytes(), "big")
+        
+    def add(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add an item to the run's clusters of near-duplicates.
+        
+        Returns the item if it starts a new cluster. A duplicate of an earlier
+        item returns None and is merged into that item in place: engagement is
+        summed and, when the duplicate is richer, its content replaces the kept
+        item's. The kept item lists every collected item of its cluster under
+        "members". Callers must add every item before scoring any of them, since
+        a kept item's content can still change until then.
+        """
+        # A link post is matched on both its own URL and the page it links to
+        urls = [url for url in (self.canonicalize(item.get(field, "") or "") for field in ("url", "link_url")) if url]
+        fp = self.fingerprint(item)
+        keys = self._table_keys(fp) if fp else []
+        
+        match = next((self._url_index[url] for url in urls if url in self._url_index), None)
+        if match is None:
+            candidates = {j for key in keys for j in self._buckets.get(key, [])}
+            match = next((
+                j for j in sorted(candidates)
+                if bin(fp ^ self._fingerprints[j]).count("1") <= self.max_distance
+            ), None)
+            
+        if match is not None:
+            representative = self._representatives[match]
+            members = representative.setdefault("members", [dict(representative)])
+            sources = representative.setdefault("sources", [self._source(representative)])
+            members.append(item)
+            sources.append(self._source(item))
+            if self._richness(item) > self._richness(representative):
+                # Swap the content inside the same dict, which is what was passed downstream
+                representative.clear()
+                representative.update(item)
+                representative["sources"] = sources
+                representative["members"] = members
+            representative["engagement"] = sum(source["engagement"] for source in sources)
+            for url in urls:
+                self._url_index.setdefault(url, match)
+            self.logger.debug(f"Merged duplicate '{item.get('title', '')}' into '{representative.get('title', '')}'")
+            return None
+            
+        index = len(self._representatives)
+        self._representatives.append(item)
+        self._fingerprints.append(fp)
+        for url in urls:
+            self._url_index.setdefault(url, index)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(index)
+        return item
+        
+    def _richness(self, item: Dict[str, Any]) -> int:
+        """How much content an item carries; the richest member of a cluster is kept."""
+        return len(f"{item.get('title', '')}{item.get('text', '')}{item.get('readme', '')}")
+        
+    def _table_keys(self, fp: int) -> List[tuple]:
+        """LSH bucket keys for a fingerprint, one per table."""
+        return [(table, fp & mask) for table, mask in enumerate(self.table_masks)]
+        
+    def _source(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Provenance record for one member of a cluster."""
+        return {
+            "platform": item.get("platform", "Unknown"),
+            "url": item.get("url", ""),
+            "engagement": platform_engagement(item)
+        }
@@ -1,30 +1,160 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
-from llama_index.llms.openai import OpenAI
+import asyncio
+import json
+import math
+import re
+import zlib
+import numpy as np
 import logging
+from ..clients.registry import get_clients
+from ..clients.ratelimit import estimate_tokens
+from ..clients.responses import parse_json
+from .ranking import engagement, top_k
+
+class SemanticScorer:
+    """Local relevance scorer: hashed TF-IDF cosine similarity against exemplar texts."""
+    
+    DEFAULT_EXEMPLARS = [
+        "An open source framework for building autonomous AI agents that plan, call tools and complete multi-step tasks.",
+        "A multi-agent system where LLM agents collaborate, delegate work and share memory to automate workflows.",
+        "An AI assistant that integrates with developer tools and APIs to automate real business processes.",
+        "A new agent architecture for LLMs with planning, reflection and long-term memory, with code and benchmarks.",
+    ]
+    TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initialize the scorer and vectorize the exemplars once.
+        
+        Args:
+            config: Semantic tier settings (exemplars, n_features, similarity_scale,
+                chunk_size)
+        """
+        self.n_features = config.get("n_features", 2 ** 14)
+        # Rows vectorized at once; bounds the dense matrix at chunk_size x n_features
+        self.chunk_size = config.get("chunk_size", 256)
+        self.similarity_scale = config.get("similarity_scale", 0.4)
+        self.exemplars = config.get("exemplars") or self.DEFAULT_EXEMPLARS
+        
+        exemplar_tf = self._term_frequencies(self.exemplars)
+        # IDF is fixed by the exemplars so the same text always gets the same score
+        doc_freq = np.count_nonzero(exemplar_tf, axis=0)
+        self.idf = (np.log((1 + len(self.exemplars)) / (1 + doc_freq)) + 1).astype(np.float32)
+        self.exemplar_matrix = self._normalize(exemplar_tf * self.idf)
+        
+    def _features(self, text: str) -> List[int]:
+        """Hashed unigram and bigram feature indices of a text."""
+        tokens = self.TOKEN_PATTERN.findall(text.lower())
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(term.encode()) % self.n_features for term in terms]
+        
+    def _term_frequencies(self, texts: List[str]) -> np.ndarray:
+        """Sublinear term-frequency matrix, one row per text."""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            rows.extend([row] * len(features))
+            cols.extend(features)
+        np.add.at(matrix, (rows, cols), 1)
+        return np.log1p(matrix)
+        
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize rows, leaving empty rows at zero."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+        
+    def score(self, texts: List[str]) -> np.ndarray:
+        """Relevance in 0-1 for each text: best exemplar cosine similarity, rescaled."""
+        scores = np.zeros(len(texts), dtype=np.float32)
+        for start in range(0, len(texts), self.chunk_size):
+            chunk = texts[start:start + self.chunk_size]
+            documents = self._normalize(self._term_frequencies(chunk) * self.idf)
+            similarity = documents @ self.exemplar_matrix.T
+            scores[start:start + len(chunk)] = np.minimum(similarity.max(axis=1) / self.similarity_scale, 1.0)
+        return scores
 
 class ContentFilter:
     """Filter and score content for relevance."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize with configuration."""
+    RELEVANCE_CRITERIA = """
+        1. Technical Innovation (0-10):
+           - Novel AI approaches or technologies
+           - Technical implementation details
+           - Research or development insights
+           
+        2. Practical Application (0-10):
+           - Real-world use cases
+           - Implementation examples
+           - Business or industry impact
+           
+        3. Timeliness (0-10):
+           - Current relevance
+           - Future potential
+           - Trend alignment
+           
+        4. Quality & Credibility (0-10):
+           - Information depth
+           - Source reliability
+           - Technical accuracy
+    """
+    SCORE_FIELDS = ("technical_score", "practical_score", "timeliness_score", "quality_score")
+    # Expected completion tokens of a single-item score object, and per item of a batch
+    ITEM_COMPLETION_TOKENS = 100
+    BATCH_COMPLETION_TOKENS = 80
+    # Bump when the scoring prompts change so cached scores are not reused
+    PROMPT_VERSION = "1"
+    MODEL = "gpt-4o-mini"
+    
+    def __init__(self, config: Dict[str, Any], score_cache=None, clients=None):
+        """
+        Initialize with configuration.
+        
+        Args:
+            config: Filter settings
+            score_cache: Optional SQLiteCache for LLM relevance scores
+            clients: Optional ClientRegistry; the process-wide one by default
+        """
         self.config = config
+        self.score_cache = score_cache
+        self.clients = clients or get_clients()
         self.keywords = [
             "ai agent", "autonomous ai", "llm agent", "ai assistant",
             "autonomous agent", "ai system", "agent architecture",
             "multi-agent", "agent framework"
         ]
+        self.keyword_pattern = self._compile_keywords(self.keywords)
         logging.basicConfig(level=logging.DEBUG)
         self.logger = logging.getLogger(__name__)
-        self.llm = OpenAI(model="gpt-4o-mini")
+        semantic_config = config.get("semantic", {})
+        self.semantic = SemanticScorer(semantic_config) if semantic_config.get("enabled") else None
+        self.reset_budget()
+        
+    @property
+    def llm(self):
+        """Scoring LLM, created on first use and shared with other components."""
+        return self.clients.llm(self.MODEL)
+        
+    async def _complete(self, prompt: str, completion_tokens: int) -> Any:
+        """
+        Run one scoring completion within the model's shared rate limit.
         
+        request_timeout applies to each attempt, not to time spent waiting for quota.
+        """
+        limiter = self.clients.limiter("openai", self.MODEL)
+        timeout = self.config.get("request_timeout", 60)
+        return await limiter.run(lambda: asyncio.wait_for(self.llm.acomplete(prompt), timeout),
+                                 estimate_tokens(prompt, completion=completion_tokens))
+                                 
     async def filter_content(self, posts: List[Dict[str, Any]], source: str = "") -> List[Dict[str, Any]]:
         """Filter posts based on relevance and freshness."""
         if not posts:
             return []
             
         filtered = []
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.config.get("max_age_days", 30))
+        cutoff_date = self._cutoff_date()
         
         for post in posts:
             self.logger.debug(f"Processing post: {post.get('title', 'No title')}")
@@ -45,19 +175,15 @@ class ContentFilter:
                 self.logger.debug("Post added to filtered list")
             
         self.logger.debug(f"Total posts filtered: {len(filtered)}")
-        return filtered[:self.config.get("max_posts_per_source", 3)]
+        return top_k(filtered, self.config.get("max_posts_per_source", 3))
         
     def _meets_basic_criteria(self, post: Dict[str, Any], cutoff_date: datetime) -> bool:
         """Check if post meets basic filtering criteria."""
         try:
             # Check creation date
-            created_utc = post.get("created_utc")
-            if created_utc:
-                created_at = datetime.fromtimestamp(created_utc, tz=timezone.utc)
-                self.logger.debug(f"Post date: {created_at}, Cutoff date: {cutoff_date}")
-                if created_at < cutoff_date:
-                    self.logger.debug("Post too old")
-                    return False
+            if not self._is_fresh(post, cutoff_date):
+                self.logger.debug("Post too old")
+                return False
             
             # Check score/points
             score = post.get("score", post.get("points", 0))
@@ -72,21 +198,52 @@ class ContentFilter:
             self.logger.error(f"Error in basic criteria check: {e}")
             return False
             
+    def _is_fresh(self, post: Dict[str, Any], cutoff_date: datetime) -> bool:
+        """Whether a post was created after the cutoff; posts without a creation time pass."""
+        # Reddit reports created_utc, HackerNews created_at_i
+        created = post.get("created_utc") or post.get("created_at_i")
+        if not created:
+            return True
+        try:
+            created_at = datetime.fromtimestamp(float(created), tz=timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
+            return True
+        self.logger.debug(f"Post date: {created_at}, Cutoff date: {cutoff_date}")
+        return created_at >= cutoff_date
+        
+    @staticmethod
+    def _compile_keywords(keywords: List[str]) -> "re.Pattern":
+        """
+        Compile all keywords into one word-bounded alternation.
+        
+        The lookahead makes every match zero-width, so keywords that overlap
+        (e.g. "ai agent" inside "ai agent framework") are all found in one pass.
+        Longer keywords are tried first; a trailing plural "s" is allowed.
+        """
+        alternatives = "|".join(re.escape(kw) for kw in sorted(set(keywords), key=len, reverse=True))
+        return re.compile(rf"(?=\b({alternatives})s?\b)")
+        
     def _calculate_relevance(self, post: Dict[str, Any]) -> float:
         """Calculate relevance score for a post."""
         score = 0.0
-        content = f"{post.get('title', '')} {post.get('text', '')}".lower()
-        
-        # Keyword matching
-        keyword_matches = 0
-        for keyword in self.keywords:
-            if keyword in content:
-                keyword_matches += 1
-                self.logger.debug(f"Matched keyword: {keyword}")
+        # Lowercase the title on its own, so match offsets line up with its length
+        # even where lowercasing changes the length ("İ" becomes two characters)
+        title = (post.get('title', '') or '').lower()
+        content = f"{title} {(post.get('text', '') or '').lower()}"
         
+        # Keyword matching in a single pass over title + text
+        matched = set()
+        title_match = False
+        for match in self.keyword_pattern.finditer(content):
+            matched.add(match.group(1))
+            if match.end(1) <= len(title):
+                title_match = True
+        if matched:
+            self.logger.debug(f"Matched keywords: {sorted(matched)}")
+            
         # Calculate scores
-        keyword_score = min(keyword_matches * 0.2, 0.6)
-        title_score = 0.3 if any(kw in post.get('title', '').lower() for kw in self.keywords) else 0
+        keyword_score = min(len(matched) * 0.2, 0.6)
+        title_score = 0.3 if title_match else 0
         
         # Combine scores
         score = keyword_score + title_score
@@ -94,12 +251,179 @@ class ContentFilter:
         self.logger.debug(f"Final relevance score: {score}")
         return min(score, 1.0)
         
+    def score_many(self, posts: List[Dict[str, Any]]) -> List[float]:
+        """Keyword relevance scores for a batch of posts, in input order."""
+        return [self._calculate_relevance(post) for post in posts]
+        
+    def _engagement_score(self, post: Dict[str, Any]) -> float:
+        """Platform engagement (stars, score or points) on a 0-1 log scale."""
+        scale = self.config.get("cascade", {}).get("engagement_scale", 1000)
+        return min(math.log1p(max(engagement(post), 0)) / math.log1p(scale), 1.0)
+        
+    def score_semantic(self, posts: List[Dict[str, Any]]) -> List[float]:
+        """Local semantic relevance for a batch of posts (zeros when the tier is off)."""
+        if self.semantic is None:
+            return [0.0] * len(posts)
+        texts = [f"{post.get('title', '') or ''} {self._get_cleaned_content(post)}" for post in posts]
+        return self.semantic.score(texts).tolist()
+        
+    def cheap_scores(self, posts: List[Dict[str, Any]]) -> List[float]:
+        """
+        First cascade tier, no API calls.
+        
+        Relevance is the better of the keyword and local semantic scores,
+        blended with engagement.
+        """
+        weight = self.config.get("cascade", {}).get("engagement_weight", 0.2)
+        relevance = self.score_many(posts)
+        if self.semantic is not None:
+            relevance = [max(k, s) for k, s in zip(relevance, self.score_semantic(posts))]
+        return [(1 - weight) * r + weight * self._engagement_score(post) for r, post in zip(relevance, posts)]
+        
+    def cheap_score(self, post: Dict[str, Any]) -> float:
+        """First cascade tier for a single post."""
+        return self.cheap_scores([post])[0]
+        
+    def reset_budget(self) -> None:
+        """Start a new run's LLM budget for the scoring cascade."""
+        self.llm_calls_used = 0
+        self.llm_tokens_used = 0
+        
+    async def score_cascade(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score posts with the cost-aware cascade and keep those above min_score.
+        
+        Every post gets a cheap score. Only the top_k posts and those whose cheap
+        score lies inside uncertainty_band are sent to the LLM, and only while the
+        per-run max_llm_calls / max_llm_tokens budget lasts (cached LLM scores are
+        free). Everything else keeps its cheap score. Posts are expected to have
+        passed their source's filter already; posts older than max_age_days are
+        dropped before any scoring. Sets relevance_score and relevance_tier
+        ("keyword" or "llm") on the returned posts.
+        """
+        config = self.config.get("cascade", {})
+        low, high = config.get("uncertainty_band", [0.3, 0.7])
+        llm_top_k = config.get("top_k", 5)
+        
+        cutoff_date = self._cutoff_date()
+        fresh = [post for post in posts if self._is_fresh(post, cutoff_date)]
+        if len(fresh) < len(posts):
+            self.logger.info(f"Dropped {len(posts) - len(fresh)} posts older than "
+                             f"{self.config.get('max_age_days', 30)} days")
+        posts = fresh
+        
+        cheap = self.cheap_scores(posts)
+        ranked = sorted(range(len(posts)), key=lambda i: cheap[i], reverse=True)
+        escalated = [i for rank, i in enumerate(ranked) if rank < llm_top_k or low <= cheap[i] <= high]
+        
+        llm_scores = await self._score_contents([posts[i] for i in escalated], within_budget=True)
+        final = {i: (score, "keyword") for i, score in enumerate(cheap)}
+        for i, scores in zip(escalated, llm_scores):
+            if scores is not None:
+                final[i] = (scores["final_score"], "llm")
+                
+        self.logger.info(
+            f"Cascade scored {len(posts)} posts, {sum(tier == 'llm' for _, tier in final.values())} by LLM "
+            f"(run budget used: {self.llm_calls_used} calls, {self.llm_tokens_used} tokens)"
+        )
+        
+        selected = []
+        for i, post in enumerate(posts):
+            score, tier = final[i]
+            if score >= config.get("min_score", 0.5):
+                post["relevance_score"] = score
+                post["relevance_tier"] = tier
+                selected.append(post)
+        return selected
+        
+    def _charge(self, prompt: str, completion_tokens: int) -> bool:
+        """
+        Charge one request to the per-run LLM budget.
+        
+        The cost is the whole prompt (template, criteria and items) plus the
+        expected completion. Returns False, charging nothing, when the request
+        does not fit the remaining calls or tokens.
+        """
+        config = self.config.get("cascade", {})
+        max_tokens = config.get("max_llm_tokens")
+        max_calls = config.get("max_llm_calls")
+        cost = estimate_tokens(prompt, completion=completion_tokens)
+        if max_calls is not None and self.llm_calls_used >= max_calls:
+            return False
+        if max_tokens is not None and self.llm_tokens_used + cost > max_tokens:
+            return False
+        self.llm_calls_used += 1
+        self.llm_tokens_used += cost
+        return True
+        
+    def _take_budget(self, contents: List[Dict[str, Any]], indices: List[int]) -> List[List[int]]:
+        """Plan batches in priority order and admit those that fit the remaining per-run LLM budget."""
+        batches = [
+            batch for batch in self._plan_batches(contents, indices)
+            if self._charge(self._batch_prompt(contents, batch), self.BATCH_COMPLETION_TOKENS * len(batch))
+        ]
+        skipped = len(indices) - sum(len(batch) for batch in batches)
+        if skipped:
+            self.logger.info(f"LLM budget exhausted, {skipped} items keep their keyword score")
+        return batches
+        
     async def analyze_relevance(self, content: Dict[str, Any]) -> float:
         """Analyze content relevance using LLM with structured criteria."""
         # First apply basic filtering
-        if not self._meets_basic_criteria(content, datetime.now(timezone.utc)):
+        if not self._meets_basic_criteria(content, self._cutoff_date()):
             return 0.0
             
+        scores = self._cached_scores(content)
+        if scores is None:
+            scores = await self._analyze_scores(content)
+            self._store_scores(content, scores)
+        return scores["final_score"] if scores else 0.0
+        
+    async def analyze_relevance_batch(self, contents: List[Dict[str, Any]]) -> List[float]:
+        """
+        Score many items with as few LLM requests as possible.
+        
+        Items failing the basic criteria score 0.0 without a request; the rest
+        are scored in batches as by the cascade, but without its per-run budget.
+        
+        Returns:
+            Final scores in input order, 0.0 where scoring failed
+        """
+        cutoff_date = self._cutoff_date()
+        eligible = [i for i, content in enumerate(contents) if self._meets_basic_criteria(content, cutoff_date)]
+        scores = await self._score_contents([contents[i] for i in eligible])
+        final_scores = [0.0] * len(contents)
+        for i, score in zip(eligible, scores):
+            if score:
+                final_scores[i] = score["final_score"]
+        return final_scores
+        
+    def _score_cache_key(self, content: Dict[str, Any]) -> str:
+        """Cache key over the exact inputs of the scoring prompt."""
+        return self.score_cache.make_key(
+            content.get('title', ''),
+            self._get_cleaned_content(content),
+            self.PROMPT_VERSION,
+            self.MODEL
+        )
+        
+    def _cached_scores(self, content: Dict[str, Any]) -> Optional[Dict[str, float]]:
+        """Previously stored per-criterion scores for this content, if any."""
+        if self.score_cache is None:
+            return None
+        return self.score_cache.get(self._score_cache_key(content))
+        
+    def _store_scores(self, content: Dict[str, Any], scores: Optional[Dict[str, float]]) -> None:
+        """Persist validated scores; failures are not cached so they are retried."""
+        if self.score_cache is not None and scores is not None:
+            self.score_cache.set(self._score_cache_key(content), scores)
+            
+    def score_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Hit/miss statistics of the score cache, or None when caching is off."""
+        return self.score_cache.stats() if self.score_cache is not None else None
+        
+    def _item_prompt(self, content: Dict[str, Any]) -> str:
+        """Scoring prompt for a single item."""
         prompt = """
         Analyze the following content's relevance to AI technology and development.
         
@@ -109,60 +433,209 @@ class ContentFilter:
         Date: {date}
         
         Evaluate based on these specific criteria:
-        1. Technical Innovation (0-10):
-           - Novel AI approaches or technologies
-           - Technical implementation details
-           - Research or development insights
+        {criteria}
         
-        2. Practical Application (0-10):
-           - Real-world use cases
-           - Implementation examples
-           - Business or industry impact
-        
-        3. Timeliness (0-10):
-           - Current relevance
-           - Future potential
-           - Trend alignment
-        
-        4. Quality & Credibility (0-10):
-           - Information depth
-           - Source reliability
-           - Technical accuracy
-        
-        Return only a JSON object with scores and final_score:
+        Return only a JSON object with scores and final_score (normalized to a 0-1 scale):
         {{
             "technical_score": X,
             "practical_score": X,
             "timeliness_score": X,
             "quality_score": X,
-            "final_score": X.X  // Normalized to 0-1 scale
+            "final_score": X.X
         }}
         """
         
-        formatted_prompt = prompt.format(
+        return prompt.format(
             title=content.get('title', ''),
             text=self._get_cleaned_content(content),
-            date=self._format_date(content.get('created_utc', None))
+            date=self._format_date(content.get('created_utc', None)),
+            criteria=self.RELEVANCE_CRITERIA
         )
         
+    async def _analyze_scores(self, content: Dict[str, Any],
+                              within_budget: bool = False) -> Optional[Dict[str, float]]:
+        """
+        Score one item with the LLM, returning validated per-criterion scores or None.
+        
+        Args:
+            content: Item to score
+            within_budget: Charge the request to the per-run LLM budget, and
+                return None without a request when it does not fit
+        """
+        prompt = self._item_prompt(content)
+        if within_budget and not self._charge(prompt, self.ITEM_COMPLETION_TOKENS):
+            return None
+            
         try:
-            response = await self.llm.acomplete(formatted_prompt)
-            scores = eval(response.text.strip())  # Parse JSON response
-            return scores['final_score']
+            response = await self._complete(prompt, self.ITEM_COMPLETION_TOKENS)
+            scores = self._validate_scores(parse_json(response.text))
+            if scores is None:
+                raise ValueError(f"Invalid score object: {response.text.strip()[:200]}")
+            return scores
+        except asyncio.TimeoutError:
+            self.logger.error(f"Timed out analyzing content after {self.config.get('request_timeout', 60)}s")
+            return None
         except Exception as e:
-            print(f"Error analyzing content: {e}")
-            return 0.0
+            self.logger.error(f"Error analyzing content: {e}")
+            return None
+            
+    async def _score_contents(self, contents: List[Dict[str, Any]],
+                              within_budget: bool = False) -> List[Optional[Dict[str, float]]]:
+        """
+        LLM scores for every item, in input order (None where scoring failed).
+        
+        Items are packed into batches that fit batch_token_budget (capped at
+        max_batch_size). Each request returns a JSON array keyed by item ID;
+        items missing from or invalid in the response are retried one at a time.
+        
+        Args:
+            contents: Items to score
+            within_budget: Charge every request, retries included, to the
+                cascade's per-run LLM budget and send only those that fit;
+                the other items get None
+        """
+        scores: List[Optional[Dict[str, float]]] = [None] * len(contents)
+        
+        # Previously scored content costs nothing
+        for i in range(len(contents)):
+            scores[i] = self._cached_scores(contents[i])
+        pending = [i for i in range(len(contents)) if scores[i] is None]
+        if within_budget:
+            batches = self._take_budget(contents, pending)
+            pending = [i for batch in batches for i in batch]
+        else:
+            batches = self._plan_batches(contents, pending)
             
+        semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 4))
+        
+        async def run_batch(batch: List[int]) -> None:
+            async with semaphore:
+                results = await self._score_batch(contents, batch)
+            for i in batch:
+                scores[i] = results.get(i)
+                
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        
+        failed = [i for i in pending if scores[i] is None]
+        if failed:
+            self.logger.info(f"Retrying {len(failed)} items individually after batch scoring")
+            
+            async def retry(i: int) -> None:
+                async with semaphore:
+                    # Each retry is charged too; once the budget is used up the rest are not sent
+                    scores[i] = await self._analyze_scores(contents[i], within_budget=within_budget)
+                    
+            await asyncio.gather(*(retry(i) for i in failed))
+            
+        for i in pending:
+            self._store_scores(contents[i], scores[i])
+            
+        return scores
+        
+    def _plan_batches(self, contents: List[Dict[str, Any]], indices: List[int]) -> List[List[int]]:
+        """Group item indices into batches that fit the per-request token budget."""
+        budget = self.config.get("batch_token_budget", 6000)
+        max_size = self.config.get("max_batch_size", 20)
+        batches, current, used = [], [], 0
+        for i in indices:
+            cost = self._estimate_tokens(contents[i])
+            if current and (used + cost > budget or len(current) >= max_size):
+                batches.append(current)
+                current, used = [], 0
+            current.append(i)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+        
+    def _estimate_tokens(self, content: Dict[str, Any]) -> int:
+        """Rough prompt token cost of one item (about four characters per token)."""
+        return (len(content.get('title', '') or '') + len(self._get_cleaned_content(content))) // 4 + 60
+        
+    def _batch_prompt(self, contents: List[Dict[str, Any]], batch: List[int]) -> str:
+        """Scoring prompt for a batch of items, identified by their indices."""
+        items = [
+            {
+                "id": str(i),
+                "title": contents[i].get('title', ''),
+                "description": self._get_cleaned_content(contents[i]),
+                "date": self._format_date(contents[i].get('created_utc', None))
+            }
+            for i in batch
+        ]
+        prompt = f"""
+        Analyze each of the following items' relevance to AI technology and development.
+        
+        Items to analyze (JSON):
+        {json.dumps(items, ensure_ascii=False)}
+        
+        Evaluate each item based on these specific criteria:
+        {self.RELEVANCE_CRITERIA}
+        
+        Return only a JSON array with exactly one object per item, using the item's id:
+        [
+            {{"id": "<item id>", "technical_score": X, "practical_score": X,
+              "timeliness_score": X, "quality_score": X, "final_score": X.X}}
+        ]
+        final_score is normalized to a 0-1 scale.
+        """
+        return prompt
+        
+    async def _score_batch(self, contents: List[Dict[str, Any]], batch: List[int]) -> Dict[int, Dict[str, float]]:
+        """Score one batch in a single request; returns validated scores by item index."""
+        try:
+            response = await self._complete(self._batch_prompt(contents, batch),
+                                            self.BATCH_COMPLETION_TOKENS * len(batch))
+            parsed = parse_json(response.text)
+            if not isinstance(parsed, list):
+                raise ValueError("Expected a JSON array")
+        except asyncio.TimeoutError:
+            self.logger.error(f"Timed out analyzing batch of {len(batch)} items "
+                              f"after {self.config.get('request_timeout', 60)}s")
+            return {}
+        except Exception as e:
+            self.logger.error(f"Error analyzing batch of {len(batch)} items: {e}")
+            return {}
+            
+        expected = {str(i): i for i in batch}
+        results = {}
+        for entry in parsed:
+            if not isinstance(entry, dict) or str(entry.get("id")) not in expected:
+                continue
+            index = expected[str(entry["id"])]
+            scores = self._validate_scores(entry)
+            if scores is not None and index not in results:
+                results[index] = scores
+        return results
+        
+    def _validate_scores(self, data: Any) -> Optional[Dict[str, float]]:
+        """Return the score fields as floats if they are present and in range, else None."""
+        if not isinstance(data, dict):
+            return None
+        try:
+            scores = {field: float(data[field]) for field in self.SCORE_FIELDS + ("final_score",)}
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not 0 <= scores["final_score"] <= 1:
+            return None
+        if not all(0 <= scores[field] <= 10 for field in self.SCORE_FIELDS):
+            return None
+        return scores
+        
+    def _cutoff_date(self) -> datetime:
+        """Oldest creation date that still passes the freshness check."""
+        return datetime.now(timezone.utc) - timedelta(days=self.config.get("max_age_days", 30))
+        
     def _get_cleaned_content(self, content: Dict[str, Any]) -> str:
         """Extract and clean the main content."""
         # For Reddit
         if 'selftext' in content:
-            text = content.get('selftext', '')
+            text = content.get('selftext') or ''
         # For HackerNews
         elif 'text' in content:
-            text = content.get('text', '')
+            text = content.get('text') or ''
         else:
-            text = content.get('description', '')
+            text = content.get('description') or ''
             
         # Clean and truncate if needed
         text = text.strip()
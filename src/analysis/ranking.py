@@ -0,0 +1,52 @@
+from typing import List, Dict, Any, Tuple
+from datetime import datetime
+import heapq
+
+def platform_engagement(item: Dict[str, Any]) -> int:
+    """Platform-native engagement count (stars, score or points)."""
+    for field in ("stars", "score", "points"):
+        try:
+            if item.get(field) is not None:
+                return int(item[field])
+        except (ValueError, TypeError):
+            continue
+    return 0
+
+def engagement(item: Dict[str, Any]) -> int:
+    """Engagement summed over a deduplicated item's sources, else its platform-native count."""
+    try:
+        if item.get("engagement") is not None:
+            return int(item["engagement"])
+    except (ValueError, TypeError):
+        pass
+    return platform_engagement(item)
+
+def _recency(item: Dict[str, Any]) -> float:
+    """Unix timestamp of the item's creation or last update, 0 when unknown."""
+    for field in ("created_utc", "created_at_i"):
+        try:
+            if item.get(field) is not None:
+                return float(item[field])
+        except (ValueError, TypeError):
+            continue
+    updated_at = item.get("updated_at")
+    if isinstance(updated_at, str):
+        try:
+            return datetime.fromisoformat(updated_at.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return 0.0
+
+def rank_key(item: Dict[str, Any]) -> Tuple[float, int, float]:
+    """Sort key: relevance score, then engagement, then recency (higher is better)."""
+    return (float(item.get("relevance_score") or 0.0), engagement(item), _recency(item))
+
+def top_k(items: List[Dict[str, Any]], k: int) -> List[Dict[str, Any]]:
+    """
+    The k best items by rank_key, best first.
+    
+    Selection is not streamed: the run's scores come from one cascade call
+    over every candidate, and dedup can still replace a kept item's content
+    until the last source finishes, so no item is final before then.
+    """
+    return heapq.nlargest(k, items, key=rank_key)
@@ -0,0 +1 @@
+"""Shared LLM and Composio clients, their rate limits and response helpers."""
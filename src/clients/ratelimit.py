@@ -0,0 +1,244 @@
+"""Request and token rate limits per provider and model, with adaptive backoff."""
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+from email.utils import parsedate_to_datetime
+import asyncio
+import logging
+import random
+import re
+import time
+
+class TokenBucket:
+    """Continuously refilling budget of units (requests or tokens) per minute."""
+    
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket.
+        
+        Args:
+            per_minute: Units that become available per minute; also the burst size
+        """
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        
+    def refill(self, scale: float = 1.0) -> None:
+        """Add the units accrued since the last refill at scale times the nominal rate."""
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate * scale)
+        self.updated = now
+        
+    def wait_time(self, amount: float, scale: float = 1.0) -> float:
+        """Seconds until amount units are available (0 when they already are)."""
+        self.refill(scale)
+        # A request larger than the whole bucket waits for a full bucket rather than forever
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / (self.rate * scale)
+        
+    def take(self, amount: float) -> None:
+        """Consume units; the level may go negative when actual usage exceeded the estimate."""
+        self.level = min(self.capacity, self.level - amount)
+
+class RateLimiter:
+    """Request and token limits for one provider and model, with adaptive backoff."""
+    
+    # Multiplicative decrease once per backoff window, additive recovery on every success
+    DECREASE = 0.5
+    RECOVERY = 0.05
+    MIN_SCALE = 0.1
+    
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initialize the limiter.
+        
+        Args:
+            name: Provider and model, used in logs and stats
+            requests_per_minute: Request quota; None leaves requests unlimited
+            tokens_per_minute: Token quota; None leaves tokens unlimited
+            max_retries: Retries of a rate-limited call before the error is raised
+            base_delay: Seconds before the first retry when the provider gives no
+                Retry-After; doubles on every retry
+            max_delay: Upper bound on that delay in seconds
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.scale = 1.0  # fraction of the configured rate currently allowed
+        self.blocked_until = 0.0
+        # End of the backoff window of the last decrease
+        self.decreased_until = 0.0
+        self.counters = {"requests": 0, "rate_limited": 0, "waited_seconds": 0.0}
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+        
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until one request of about this many tokens fits the limits, then reserve it.
+        
+        Waiters queue on a lock, so callers are admitted in arrival order and a
+        large request cannot be starved by a stream of small ones.
+        """
+        async with self._lock:
+            while True:
+                delay = self.blocked_until - time.monotonic()
+                if self.requests:
+                    delay = max(delay, self.requests.wait_time(1, self.scale))
+                if self.tokens and tokens:
+                    delay = max(delay, self.tokens.wait_time(tokens, self.scale))
+                if delay <= 0:
+                    break
+                self.counters["waited_seconds"] += delay
+                await asyncio.sleep(delay)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            self.counters["requests"] += 1
+            
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """Correct the token reservation once the provider reported actual usage."""
+        if self.tokens and used is not None:
+            self.tokens.take(used - reserved)
+            
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Align the buckets with x-ratelimit-* headers reported by the provider."""
+        for kind, bucket in (("requests", self.requests), ("tokens", self.tokens)):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            try:
+                remaining = float(remaining) if remaining is not None else None
+            except ValueError:
+                remaining = None
+            if remaining is None:
+                continue
+            if bucket is not None:
+                bucket.refill(self.scale)
+                bucket.level = min(bucket.level, remaining)
+            if remaining < 1 and reset:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + reset)
+                
+    def backoff(self, retry_after: Optional[float], attempt: int) -> float:
+        """
+        Slow down after a rate-limit error; returns the pause in seconds.
+        
+        Calls rejected together (a burst of concurrent 429s) report the same
+        overload, so the rate is decreased once per backoff window rather than
+        once per error.
+        """
+        self.counters["rate_limited"] += 1
+        now = time.monotonic()
+        if retry_after is None:
+            # Jitter spreads retries of calls that were rejected together
+            retry_after = min(self.base_delay * 2 ** attempt, self.max_delay) * random.uniform(0.8, 1.2)
+        if now >= self.decreased_until:
+            self.scale = max(self.MIN_SCALE, self.scale * self.DECREASE)
+            self.decreased_until = now + retry_after
+        self.blocked_until = max(self.blocked_until, now + retry_after)
+        return retry_after
+        
+    async def run(self, call: Callable[[], Awaitable[Any]], tokens: int = 0, retry: bool = True) -> Any:
+        """
+        Run a provider call within the limits, retrying it on rate-limit errors.
+        
+        Args:
+            call: Zero-argument function returning a fresh awaitable for each attempt
+            tokens: Estimated prompt plus completion tokens of the call
+            retry: False for calls with side effects that must not be repeated;
+                a rate-limit error still slows down every other caller
+                
+        Returns:
+            The call's result; other errors, and rate-limit errors after
+            max_retries, are raised unchanged
+        """
+        max_retries = self.max_retries if retry else 0
+        for attempt in range(max_retries + 1):
+            await self.acquire(tokens)
+            try:
+                result = await call()
+            except Exception as e:
+                limited = rate_limit_info(e)
+                if limited is None:
+                    raise
+                headers, retry_after = limited
+                self.observe_headers(headers)
+                delay = self.backoff(retry_after, attempt)
+                if attempt >= max_retries:
+                    raise
+                self.logger.warning(f"Rate limited by {self.name}, retrying in {delay:.1f}s "
+                                    f"at {self.scale:.0%} of the configured rate")
+                continue
+            self.scale = min(1.0, self.scale + self.RECOVERY)
+            self.settle(tokens, usage_tokens(result))
+            return result
+            
+    def stats(self) -> Dict[str, Any]:
+        """Request, rate-limit and waiting counters plus the current rate scale."""
+        return {**self.counters, "waited_seconds": round(self.counters["waited_seconds"], 2),
+                "scale": round(self.scale, 2)}
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Seconds in a reset header such as "1s", "6m0s", "20ms" or "0.5"."""
+    if not value:
+        return None
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, "": 1}
+    parts = re.findall(r"([\d.]+)\s*(ms|h|m|s)?", str(value))
+    try:
+        return sum(float(number) * units[unit] for number, unit in parts) if parts else None
+    except ValueError:
+        return None
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait according to retry-after-ms or Retry-After (seconds or an HTTP date)."""
+    if headers.get("retry-after-ms"):
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def rate_limit_info(error: BaseException) -> Optional[Tuple[Dict[str, str], Optional[float]]]:
+    """
+    Recognize a rate-limit error from any client library.
+    
+    Returns the response headers (lower-cased) and the Retry-After delay, or
+    None when the error is not a rate limit.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and "RateLimit" not in type(error).__name__ \
+            and not re.search(r"\b429\b|rate.?limit", str(error), re.IGNORECASE):
+        return None
+    raw_headers = getattr(response, "headers", None) or {}
+    try:
+        headers = {str(key).lower(): str(value) for key, value in raw_headers.items()}
+    except AttributeError:
+        headers = {}
+    return headers, retry_after(headers)
+
+def usage_tokens(response: Any) -> Optional[int]:
+    """Total tokens reported in an LLM response's raw usage, if any."""
+    raw = getattr(response, "raw", None)
+    usage = raw.get("usage") if isinstance(raw, dict) else getattr(raw, "usage", None)
+    total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(usage, "total_tokens", None)
+    return int(total) if isinstance(total, (int, float)) else None
+
+def estimate_tokens(*texts: str, completion: int = 0) -> int:
+    """Rough token count of prompt texts (about four characters per token) plus the expected completion."""
+    return sum(len(text or "") for text in texts) // 4 + completion
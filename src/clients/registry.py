@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+import logging
+import threading
+from .ratelimit import RateLimiter
+
+class ClientRegistry:
+    """Process-wide LLM and Composio clients, created on first use and shared."""
+    
+    def __init__(self):
+        """Initialize an empty registry; nothing is imported or constructed yet."""
+        self._llms: Dict[Tuple[str, str], Any] = {}
+        self._toolsets: Dict[str, Any] = {}
+        self._tools: Dict[Tuple[Tuple[str, ...], str], Any] = {}
+        self._limiters: Dict[Tuple[str, str], RateLimiter] = {}
+        self._rate_limits: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        
+    def llm(self, model: str, provider: str = "openai") -> Any:
+        """
+        The shared LLM client for a provider and model.
+        
+        Each client keeps and reuses its own HTTP connection pool, so sharing
+        one instance per model shares connections across components.
+        """
+        key = (provider, model)
+        with self._lock:
+            if key not in self._llms:
+                self._llms[key] = self._create_llm(provider, model)
+            return self._llms[key]
+            
+    def _create_llm(self, provider: str, model: str) -> Any:
+        """Construct an LLM client, importing its provider package only now."""
+        if provider != "openai":
+            raise ValueError(f"Unsupported LLM provider '{provider}'")
+        from llama_index.llms.openai import OpenAI
+        self.logger.debug(f"Creating {provider} client for {model}")
+        return OpenAI(model=model)
+        
+    def toolset(self, api_key: Optional[str] = None) -> Any:
+        """The shared Composio toolset for an API key (None uses the environment)."""
+        key = api_key or ""
+        with self._lock:
+            if key not in self._toolsets:
+                from composio_llamaindex import ComposioToolSet
+                self._toolsets[key] = ComposioToolSet(api_key=api_key) if api_key else ComposioToolSet()
+            return self._toolsets[key]
+            
+    def action(self, name: str) -> Any:
+        """The Composio Action enum member for an action name, importing Composio only now."""
+        from composio_llamaindex import Action
+        return getattr(Action, name)
+        
+    def tools(self, actions: Iterable[str], api_key: Optional[str] = None) -> Any:
+        """Composio tools for a set of actions; fetched once (a network round-trip) and shared."""
+        actions = tuple(sorted(actions))
+        key = (actions, api_key or "")
+        toolset = self.toolset(api_key)
+        with self._lock:
+            if key not in self._tools:
+                self._tools[key] = toolset.get_tools(actions=list(actions))
+            return self._tools[key]
+            
+    def agent(self, actions: Iterable[str], system_prompt: str, model: str = "gpt-4o-mini",
+              api_key: Optional[str] = None, max_function_calls: int = 10) -> Any:
+        """
+        A new function-calling agent over the shared tools and LLM.
+        
+        Agents keep chat history, so each caller gets its own instance; only the
+        expensive parts underneath are shared.
+        """
+        from llama_index.core.llms import ChatMessage
+        from llama_index.core.agent import FunctionCallingAgentWorker
+        return FunctionCallingAgentWorker(
+            tools=self.tools(actions, api_key),
+            llm=self.llm(model),
+            prefix_messages=[ChatMessage(role="system", content=system_prompt)],
+            max_function_calls=max_function_calls,
+            allow_parallel_tool_calls=False,
+            verbose=True
+        ).as_agent()
+        
+    def configure_rate_limits(self, config: Dict[str, Any]) -> None:
+        """
+        Set the rate limits used by limiters created from now on.
+        
+        Args:
+            config: rate_limits section; "providers" maps a provider to per-model
+                requests_per_minute / tokens_per_minute settings, with "default"
+                for unlisted models, plus max_retries, base_delay and max_delay
+        """
+        with self._lock:
+            self._rate_limits = config or {}
+            self._limiters.clear()
+            
+    def limiter(self, provider: str, model: str = "default") -> RateLimiter:
+        """The shared rate limiter for a provider and model, so every caller draws on one quota."""
+        key = (provider, model)
+        with self._lock:
+            if key not in self._limiters:
+                config = self._rate_limits
+                models = config.get("providers", {}).get(provider) or {}
+                limits = models.get(model) or models.get("default") or {}
+                self._limiters[key] = RateLimiter(
+                    f"{provider}/{model}",
+                    requests_per_minute=limits.get("requests_per_minute"),
+                    tokens_per_minute=limits.get("tokens_per_minute"),
+                    max_retries=config.get("max_retries", 5),
+                    base_delay=config.get("base_delay", 1.0),
+                    max_delay=config.get("max_delay", 60.0)
+                )
+            return self._limiters[key]
+            
+    def stats(self) -> Dict[str, int]:
+        """How many clients of each kind have been created so far."""
+        return {"llms": len(self._llms), "toolsets": len(self._toolsets), "tool_sets": len(self._tools)}
+        
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Counters of every limiter in use, keyed by provider/model."""
+        return {limiter.name: limiter.stats() for limiter in self._limiters.values()}
+
+_registry: Optional[ClientRegistry] = None
+
+def get_clients() -> ClientRegistry:
+    """The process-wide client registry."""
+    global _registry
+    if _registry is None:
+        _registry = ClientRegistry()
+    return _registry
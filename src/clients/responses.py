@@ -0,0 +1,10 @@
+from typing import Any
+import json
+
+def parse_json(text: str) -> Any:
+    """Strictly parse a JSON LLM response, tolerating a surrounding markdown code fence."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
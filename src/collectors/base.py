@@ -1,23 +1,284 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+import asyncio
+import logging
+import time
+from datetime import datetime
+from ..clients.registry import get_clients
+from ..clients.ratelimit import estimate_tokens
 
 class BaseCollector(ABC):
     """Base class for content collectors."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize the collector with configuration."""
+    # Source name used for persisted state
+    name = "base"
+    # Item field that increases monotonically with new content, and the item ID field
+    cursor_field: Optional[str] = None
+    id_field = "id"
+    # Whether an item filter_content rejects may pass later (e.g. a score that
+    # grows with engagement), so it is collected again while it is young
+    recheck_rejected = False
+    # LLM behind the Composio agents, and tokens budgeted per agent chat for
+    # tool schemas, tool results and the reply on top of the prompt
+    agent_model = "gpt-4o-mini"
+    agent_tokens = 2000
+    
+    def __init__(self, config: Dict[str, Any], cursor_store=None, clients=None):
+        """
+        Initialize the collector with configuration.
+        
+        Args:
+            config: Source configuration
+            cursor_store: Optional CursorStore enabling incremental collection
+            clients: Optional ClientRegistry; the process-wide one by default
+        """
         self.config = config
+        # LLM, toolset and tools are created on first use and shared across components
+        self.clients = clients or get_clients()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # Bounds in-flight requests for this collector across all fan-outs
+        self.semaphore = asyncio.Semaphore(config.get("max_concurrency", 4))
+        self.cursor_store = cursor_store if config.get("incremental", True) else None
+        self._pending_cursors: Dict[str, Dict[str, Any]] = {}
+        self._held_back: set = set()
+        # Targets fanned out to, and those that failed, since reset_targets()
+        self.target_count = 0
+        self.failed_targets: List[str] = []
         
     @abstractmethod
     async def collect(self) -> List[Dict[str, Any]]:
         """Collect content from the source."""
         pass
     
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield collected items as they become available.
+        
+        The default adapter waits for collect(); collectors override this to
+        yield each target's items as soon as its request completes.
+        """
+        for item in await self.collect():
+            yield item
+            
     @abstractmethod
     async def filter_content(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter collected content based on relevance."""
         pass
+        
+    async def execute_action(self, action: Any, params: Dict[str, Any]) -> Any:
+        """
+        Execute a Composio action directly with known parameters.
+        
+        Skips the LLM agent loop entirely. The action may be given by name, so
+        collectors do not import Composio until a request is made. Each attempt
+        is bounded by request_timeout; time spent waiting for quota is not.
+        Returns the action's data payload and raises on an unsuccessful call.
+        """
+        if isinstance(action, str):
+            action = self.clients.action(action)
+        toolset = self.clients.toolset()
+        
+        async def call():
+            result = await asyncio.wait_for(
+                asyncio.to_thread(toolset.execute_action, action=action, params=params),
+                self.request_timeout
+            )
+            if not result.get("successful", result.get("successfull", True)):
+                raise RuntimeError(result.get("error") or f"Action {action} failed")
+            return result.get("data", result)
+            
+        return await self.clients.limiter("composio").run(call)
+        
+    async def agent_chat(self, prompt: str) -> Any:
+        """
+        Send a prompt to a fresh agent from _build_agent within the shared LLM rate limit.
+        
+        Retries after a rate-limit error start over with a new agent, so no
+        partial chat history is carried into the next attempt. Each attempt is
+        bounded by request_timeout.
+        """
+        limiter = self.clients.limiter("openai", self.agent_model)
+        return await limiter.run(
+            lambda: asyncio.wait_for(self._build_agent().achat(prompt), self.request_timeout),
+            estimate_tokens(prompt, completion=self.agent_tokens)
+        )
+        
+    @staticmethod
+    def extract_items(data: Any, keys: Iterable[str] = ("items", "hits", "posts", "children")) -> List[Dict[str, Any]]:
+        """Find the list of result records inside a raw action payload."""
+        if isinstance(data, list):
+            # Reddit listings wrap each record as {"kind": ..., "data": {...}}
+            return [item.get("data", item) if isinstance(item, dict) and "kind" in item else item
+                    for item in data if isinstance(item, dict)]
+        if not isinstance(data, dict):
+            return []
+        for key in keys:
+            if key in data:
+                return BaseCollector.extract_items(data[key], keys)
+        for wrapper in ("data", "response_data", "details"):
+            if isinstance(data.get(wrapper), (dict, list)):
+                return BaseCollector.extract_items(data[wrapper], keys)
+        return []
+        
+    @property
+    def request_timeout(self) -> float:
+        """Seconds allowed for one Composio or LLM request attempt."""
+        return self.config.get("request_timeout", 120)
+        
+    @property
+    def use_direct_actions(self) -> bool:
+        """Whether to call Composio actions directly instead of through the agent."""
+        return self.config.get("execution", "agent") == "direct"
     
+    def reset_targets(self) -> None:
+        """Start a new run's count of attempted and failed targets."""
+        self.target_count = 0
+        self.failed_targets = []
+        
+    async def fan_out(self, targets: Iterable[Any],
+                      fetch: Callable[[Any], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """
+        Run fetch for every target concurrently and flatten the results.
+        
+        Each call runs under the collector's semaphore, and every request it
+        makes is bounded by request_timeout. A failing or slow target is logged
+        and contributes no items; the other targets are unaffected. Results
+        keep target order.
+        """
+        results = await asyncio.gather(*(self._fetch_guarded(fetch, target) for target in targets))
+        return [item for items in results for item in items]
+        
+    async def fan_out_stream(self, targets: Iterable[Any],
+                             fetch: Callable[[Any], Awaitable[List[Dict[str, Any]]]]) -> AsyncIterator[Dict[str, Any]]:
+        """Like fan_out, but yield each target's items as soon as that target completes."""
+        tasks = [asyncio.ensure_future(self._fetch_guarded(fetch, target)) for target in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for item in await next_done:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+                
+    async def _fetch_guarded(self, fetch: Callable[[Any], Awaitable[List[Dict[str, Any]]]],
+                             target: Any) -> List[Dict[str, Any]]:
+        """Run one fetch under the semaphore, returning [] and recording the target on failure."""
+        self.target_count += 1
+        async with self.semaphore:
+            try:
+                return await fetch(target) or []
+            except asyncio.TimeoutError:
+                self.logger.error(f"A request timed out after {self.request_timeout}s collecting '{target}'")
+            except Exception as e:
+                self.logger.error(f"Error collecting '{target}': {str(e)}")
+            self.failed_targets.append(str(target))
+            return []
+            
+    def get_cursor(self, target: str) -> Optional[Dict[str, Any]]:
+        """Return the stored high-water mark for a target, if incremental collection is on."""
+        if self.cursor_store is None or self.cursor_field is None:
+            return None
+        return self.cursor_store.get(self.name, target)
+        
+    def filter_new(self, target: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop items at or below the target's high-water mark and stage the new ones.
+        
+        Items are new when their cursor value is above the mark, or equal to it
+        with an ID not seen at that value. Items without a cursor value are kept.
+        The mark only advances when commit_cursors() is called.
+        """
+        if self.cursor_store is None or self.cursor_field is None:
+            return items
+        cursor = self.cursor_store.get(self.name, target)
+        
+        high_water = cursor["value"] if cursor else None
+        seen_ids = set(cursor["ids"]) if cursor else set()
+        new_items = []
+        for item in items:
+            value = item.get(self.cursor_field)
+            if value is None or high_water is None:
+                new_items.append(item)
+            elif value > high_water or (value == high_water and self._item_id(item) not in seen_ids):
+                new_items.append(item)
+                
+        entries = [(item[self.cursor_field], self._item_id(item))
+                   for item in new_items if item.get(self.cursor_field) is not None]
+        if entries:
+            pending = self._pending_cursors.setdefault(
+                target, {"high_water": high_water, "seen_ids": seen_ids, "entries": []}
+            )
+            pending["entries"].extend(entries)
+            
+        skipped = len(items) - len(new_items)
+        if skipped:
+            self.logger.info(f"Skipped {skipped} already collected items for '{target}'")
+        return new_items
+        
+    def hold_back(self, item: Dict[str, Any]) -> None:
+        """Keep the high-water mark below an item that was not processed, so it is collected again."""
+        self._held_back.add(self._item_id(item))
+        
+    async def admit(self, item: Dict[str, Any]) -> bool:
+        """
+        Apply filter_content to one item.
+        
+        Rejected items normally let the high-water mark advance past them. When
+        recheck_rejected is set, an item younger than recheck_hours is held back
+        instead: score filters (min_score) reject most posts when they are fresh,
+        and a held-back post is collected again and may pass once it has gained
+        engagement. Older items are let go, so none pins the mark for good.
+        """
+        if await self.filter_content([item]):
+            return True
+        if self.recheck_rejected and self._age_hours(item) < self.config.get("recheck_hours", 24):
+            self.hold_back(item)
+        return False
+        
+    def _age_hours(self, item: Dict[str, Any]) -> float:
+        """Hours since an item's cursor value (epoch seconds or ISO 8601); infinite if unknown."""
+        value = item.get(self.cursor_field) if self.cursor_field else None
+        try:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            return (time.time() - float(value)) / 3600
+        except (TypeError, ValueError):
+            return float("inf")
+            
+    def commit_cursors(self) -> None:
+        """
+        Advance high-water marks past the items staged since discard_cursors().
+        
+        Call this only once the collected items have been processed, so a run
+        that fails part-way collects them again. A mark never moves past an
+        item that was held back; newer items are then collected again too
+        (the seen-item store skips them before any LLM work).
+        """
+        if self.cursor_store is not None:
+            for target, pending in self._pending_cursors.items():
+                entries = pending["entries"]
+                held = [value for value, item_id in entries if item_id in self._held_back]
+                limit = min(held) if held else None
+                done = [(value, item_id) for value, item_id in entries
+                        if item_id not in self._held_back and (limit is None or value <= limit)]
+                if not done:
+                    continue
+                top = max(value for value, _ in done)
+                ids = {item_id for value, item_id in done if value == top}
+                if top == pending["high_water"]:
+                    ids |= pending["seen_ids"]
+                self.cursor_store.set(self.name, target, top, list(ids))
+        self.discard_cursors()
+        
+    def discard_cursors(self) -> None:
+        """Forget staged marks, e.g. before a new collection or after an incomplete one."""
+        self._pending_cursors.clear()
+        self._held_back.clear()
+        
+    def _item_id(self, item: Dict[str, Any]) -> str:
+        """Stable identifier for an item, used to break high-water mark ties."""
+        return str(item.get(self.id_field) or item.get("url", ""))
+        
     def validate_config(self) -> bool:
         """Validate the collector configuration."""
         return True 
\ No newline at end of file
@@ -1,91 +1,172 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Optional
+import asyncio
+import base64
 from .base import BaseCollector
-from composio_llamaindex import ComposioToolSet, Action
-from llama_index.llms.openai import OpenAI
-from llama_index.core.llms import ChatMessage
-from llama_index.core.agent import FunctionCallingAgentWorker
 
 class GitHubCollector(BaseCollector):
     """Collector for GitHub repositories."""
     
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize the GitHub collector."""
-        super().__init__(config)
-        self.llm = OpenAI(model="gpt-4o-mini")
-        self.toolset = ComposioToolSet()
-        self.tools = self.toolset.get_tools(actions=['GITHUB_SEARCH_REPOSITORIES'])
+    name = "github"
+    cursor_field = "updated_at"
+    id_field = "full_name"
+    
+    SEARCH_QUERIES = [
+        "AI agent framework language:python stars:>100",
+        "autonomous AI agent language:python stars:>100",
+        "LLM agent framework language:python stars:>100",
+        "AI assistant framework language:python stars:>100"
+    ]
+    
+    def __init__(self, config: Dict[str, Any], readme_cache=None, cursor_store=None, clients=None):
+        """
+        Initialize the GitHub collector.
         
-        # Set up agent
-        prefix_messages = [
-            ChatMessage(
-                role="system",
-                content=(
-                    "You are a GitHub project finder specializing in AI agents and autonomous systems. "
-                    "Look for repositories that demonstrate innovative approaches to AI agents, "
-                    "autonomous systems, or agent frameworks. Focus on active projects with good documentation."
-                )
-            )
-        ]
+        Args:
+            config: GitHub source configuration
+            readme_cache: Optional SQLiteCache for READMEs keyed by full_name + updated_at
+            cursor_store: Optional CursorStore enabling incremental collection
+            clients: Optional ClientRegistry; the process-wide one by default
+        """
+        super().__init__(config, cursor_store=cursor_store, clients=clients)
+        self.readme_cache = readme_cache
         
-        self.agent = FunctionCallingAgentWorker(
-            tools=self.tools,
-            llm=self.llm,
-            prefix_messages=prefix_messages,
-            max_function_calls=10,
-            allow_parallel_tool_calls=False,
-            verbose=True
-        ).as_agent()
+    def _build_agent(self):
+        """Build a GitHub agent; each concurrent request gets its own chat history."""
+        return self.clients.agent(
+            ['GITHUB_SEARCH_REPOSITORIES'],
+            "You are a GitHub project finder specializing in AI agents and autonomous systems. "
+            "Look for repositories that demonstrate innovative approaches to AI agents, "
+            "autonomous systems, or agent frameworks. Focus on active projects with good documentation."
+        )
         
     async def collect(self) -> List[Dict[str, Any]]:
         """Collect interesting GitHub repositories."""
-        repositories = []
-        search_queries = [
-            "AI agent framework language:python stars:>100",
-            "autonomous AI agent language:python stars:>100",
-            "LLM agent framework language:python stars:>100",
-            "AI assistant framework language:python stars:>100"
-        ]
+        return [repo async for repo in self.stream()]
+        
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield repositories, with README attached, as soon as each one is ready."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.get("queue_size", 10))
+        semaphore = asyncio.Semaphore(self.config.get("readme_concurrency", 4))
         
-        for query in search_queries:
+        async def attach_readme(repo: Dict[str, Any]) -> None:
+            async with semaphore:
+                readme = await self._fetch_readme_cached(repo["full_name"], repo["updated_at"])
+            if readme is None:
+                # The filter drops repos without a README; collect this one again next run
+                self.hold_back(repo)
+            repo["readme"] = readme or ""
+            await queue.put(repo)
+            
+        async def search() -> None:
+            # A repo can match several queries; fetch each README only once
+            seen = set()
+            readme_tasks = []
+            cancelled = False
             try:
-                prompt = f"Find GitHub repositories matching: {query}"
-                response = await self.agent.achat(prompt)
-                
-                # Process the response
-                if hasattr(response, 'response'):
-                    results = response.response if isinstance(response.response, list) else [response.response]
+                async for repo in self.fan_out_stream(self.SEARCH_QUERIES, self._search_query):
+                    key = repo["full_name"] or repo["url"] or repo["title"]
+                    if key not in seen:
+                        seen.add(key)
+                        readme_tasks.append(asyncio.ensure_future(attach_readme(repo)))
+                await asyncio.gather(*readme_tasks)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                for task in readme_tasks:
+                    task.cancel()
+                # A cancelled producer's consumer has stopped reading; putting into a full queue would hang
+                if not cancelled:
+                    await queue.put(None)
                     
-                    for repo in results:
-                        # Add platform identifier and standardize fields
-                        repo_data = {
-                            "platform": "GitHub",
-                            "title": repo.get("name", ""),
-                            "text": repo.get("description", ""),
-                            "url": repo.get("html_url", ""),
-                            "stars": repo.get("stargazers_count", 0),
-                            "language": repo.get("language", ""),
-                            "created_at": repo.get("created_at", ""),
-                            "updated_at": repo.get("updated_at", ""),
-                            "topics": repo.get("topics", []),
-                            "readme": await self._fetch_readme(repo.get("full_name", ""))
-                        }
-                        repositories.append(repo_data)
-                        
-            except Exception as e:
-                print(f"Error searching GitHub with query '{query}': {str(e)}")
-                continue
+        producer = asyncio.ensure_future(search())
+        try:
+            while (repo := await queue.get()) is not None:
+                yield repo
+            await producer
+        finally:
+            producer.cancel()
+            
+    async def _search_query(self, query: str) -> List[Dict[str, Any]]:
+        """Search GitHub for one query; READMEs are attached later in stream()."""
+        repositories = []
+        target = query
+        cursor = self.get_cursor(target)
+        if cursor:
+            # Only ask for repos updated since the last run
+            query = f"{query} updated:>={cursor['value']}"
+            
+        if self.use_direct_actions:
+            data = await self.execute_action(
+                "GITHUB_SEARCH_REPOSITORIES",
+                {"q": query, "sort": "stars", "per_page": self.config.get("max_repos", 5)}
+            )
+            results = self.extract_items(data)
+        else:
+            prompt = f"Find GitHub repositories matching: {query}"
+            response = await self.agent_chat(prompt)
+            
+            # Process the response
+            results = []
+            if hasattr(response, 'response'):
+                results = response.response if isinstance(response.response, list) else [response.response]
                 
-        return repositories
+        for repo in results:
+            # Add platform identifier and standardize fields; the API returns
+            # null rather than omitting description, language and topics
+            repo_data = {
+                "platform": "GitHub",
+                "title": repo.get("name") or "",
+                "text": repo.get("description") or "",
+                "url": repo.get("html_url") or "",
+                "stars": repo.get("stargazers_count", 0),
+                "language": repo.get("language") or "",
+                "created_at": repo.get("created_at", ""),
+                "updated_at": repo.get("updated_at", ""),
+                "topics": repo.get("topics") or [],
+                "full_name": repo.get("full_name") or "",
+                "readme": ""
+            }
+            repositories.append(repo_data)
+            
+        return self.filter_new(target, repositories)
+        
+    async def _fetch_readme_cached(self, repo_full_name: str, updated_at: str) -> Optional[str]:
+        """Fetch a README, reusing the cached copy while the repo is unchanged; None on failure."""
+        if self.readme_cache is None or not repo_full_name:
+            return await self._fetch_readme(repo_full_name)
+            
+        key = self.readme_cache.make_key(repo_full_name, updated_at)
+        cached = self.readme_cache.get(key)
+        if cached is not None:
+            return cached
+        readme = await self._fetch_readme(repo_full_name)
+        if readme:
+            self.readme_cache.set(key, readme)
+        return readme
     
-    async def _fetch_readme(self, repo_full_name: str) -> str:
-        """Fetch repository README content."""
+    async def _fetch_readme(self, repo_full_name: str) -> Optional[str]:
+        """Fetch repository README content; None when the request failed."""
         try:
+            if self.use_direct_actions:
+                owner, _, repo = repo_full_name.partition("/")
+                data = await self.execute_action(
+                    "GITHUB_GET_A_REPOSITORY_README",
+                    {"owner": owner, "repo": repo}
+                )
+                data = data.get("response_data", data) if isinstance(data, dict) else {}
+                content = data.get("content", "")
+                if data.get("encoding") == "base64":
+                    content = base64.b64decode(content).decode("utf-8", errors="replace")
+                return content
+                
             prompt = f"Get the README content for repository: {repo_full_name}"
-            response = await self.agent.achat(prompt)
+            response = await self.agent_chat(prompt)
             if hasattr(response, 'response'):
                 return response.response.get("content", "")
         except Exception as e:
-            print(f"Error fetching README for {repo_full_name}: {str(e)}")
+            self.logger.error(f"Error fetching README for {repo_full_name}: {str(e)}")
+            return None
         return ""
     
     async def filter_content(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -1,64 +1,64 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from .base import BaseCollector
-from composio_llamaindex import ComposioToolSet, Action
-from llama_index.llms.openai import OpenAI
-from llama_index.core.llms import ChatMessage
-from llama_index.core.agent import FunctionCallingAgentWorker
 
 class HackerNewsCollector(BaseCollector):
     """Collector for HackerNews content."""
     
-    def __init__(self, config: Dict[str, Any]):
+    name = "hackernews"
+    # No high-water mark: search results are ranked by relevance, not time, so a
+    # created_at_i mark would drop older posts that were never collected
+    cursor_field = None
+    id_field = "objectID"
+    
+    def __init__(self, config: Dict[str, Any], cursor_store=None, clients=None):
         """Initialize the HackerNews collector."""
-        super().__init__(config)
-        self.llm = OpenAI(model="gpt-4o-mini")
-        self.toolset = ComposioToolSet()
-        self.tools = self.toolset.get_tools(actions=['HACKERNEWS_SEARCH_POSTS'])
-        
-        # Set up agent
-        prefix_messages = [
-            ChatMessage(
-                role="system",
-                content="You are a HackerNews content collector. Your task is to search for relevant posts."
-            )
-        ]
+        super().__init__(config, cursor_store=cursor_store, clients=clients)
         
-        self.agent = FunctionCallingAgentWorker(
-            tools=self.tools,
-            llm=self.llm,
-            prefix_messages=prefix_messages,
-            max_function_calls=10,
-            allow_parallel_tool_calls=False,
-            verbose=True
-        ).as_agent()
+    def _build_agent(self):
+        """Build a HackerNews agent; each concurrent request gets its own chat history."""
+        return self.clients.agent(
+            ['HACKERNEWS_SEARCH_POSTS'],
+            "You are a HackerNews content collector. Your task is to search for relevant posts."
+        )
         
     async def collect(self) -> List[Dict[str, Any]]:
         """Collect posts from HackerNews."""
+        return await self.fan_out(self.config["keywords"], self._search_keyword)
+        
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield posts as each keyword search completes."""
+        async for post in self.fan_out_stream(self.config["keywords"], self._search_keyword):
+            yield post
+            
+    async def _search_keyword(self, keyword: str) -> List[Dict[str, Any]]:
+        """Search HackerNews for posts about one keyword."""
         posts = []
-        for keyword in self.config["keywords"]:
-            try:
-                prompt = f"Search HackerNews for posts about '{keyword}'"
-                response = await self.agent.achat(prompt)
-                
-                # Process the response
-                if hasattr(response, 'response') and isinstance(response.response, dict):
-                    results = [response.response]
-                elif hasattr(response, 'response') and isinstance(response.response, list):
-                    results = response.response
-                else:
-                    results = []
+        if self.use_direct_actions:
+            data = await self.execute_action(
+                "HACKERNEWS_SEARCH_POSTS",
+                {"query": keyword, "size": self.config.get("posts_per_keyword", 20)}
+            )
+            results = self.extract_items(data)
+        else:
+            prompt = f"Search HackerNews for posts about '{keyword}'"
+            response = await self.agent_chat(prompt)
+            
+            # Process the response
+            if hasattr(response, 'response') and isinstance(response.response, dict):
+                results = [response.response]
+            elif hasattr(response, 'response') and isinstance(response.response, list):
+                results = response.response
+            else:
+                results = []
                 
-                for post in results:
-                    # Add platform identifier and standardize fields
-                    post["platform"] = "HackerNews"
-                    post["text"] = post.get("text", "")
-                    post["title"] = post.get("title", "")
-                    post["url"] = post.get("url", "")
-                    posts.append(post)
-            except Exception as e:
-                print(f"Error searching HackerNews for '{keyword}': {str(e)}")
-                continue
-        return posts
+        for post in results:
+            # Add platform identifier and standardize fields
+            post["platform"] = "HackerNews"
+            post["text"] = post.get("text") or ""
+            post["title"] = post.get("title") or ""
+            post["url"] = post.get("url") or ""
+            posts.append(post)
+        return self.filter_new(keyword, posts)
     
     async def filter_content(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter HackerNews posts based on points and relevance."""
@@ -0,0 +1,120 @@
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
+import logging
+import time
+from .base import BaseCollector
+
+class SourceOrchestrator:
+    """Run several collectors concurrently, each within its own time budget."""
+    
+    def __init__(self, collectors: Dict[str, BaseCollector], config: Dict[str, Any]):
+        """
+        Initialize the orchestrator.
+        
+        Args:
+            collectors: Collectors keyed by source name
+            config: Settings (default_time_budget, queue_size); a source's own
+                time_budget wins
+        """
+        self.collectors = collectors
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.timings: Dict[str, Dict[str, Any]] = {}
+        
+    def time_budget(self, name: str) -> float:
+        """Seconds a source may spend collecting before it is cut off."""
+        return self.collectors[name].config.get(
+            "time_budget", self.config.get("default_time_budget", 300)
+        )
+        
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield items from all sources as they arrive.
+        
+        A source that exceeds its budget is stopped; the items it already
+        produced are kept. Items are tagged with the name of their collector.
+        Each source's failed targets are recorded in its timings.
+        The queue is bounded, so sources pause while the consumer catches up;
+        that pause does not count against their budget.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.get("queue_size", 100))
+        self.timings = {}
+        
+        async def run_source(name: str, collector: BaseCollector) -> None:
+            budget = self.time_budget(name)
+            start = time.monotonic()
+            deadline = start + budget
+            timing = {"items": 0, "seconds": 0.0, "timed_out": False, "error": None,
+                      "targets": 0, "failed_targets": []}
+            self.timings[name] = timing
+            collector.reset_targets()
+            items = collector.stream()
+            try:
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    item = await asyncio.wait_for(items.__anext__(), remaining)
+                    item["collector"] = name
+                    timing["items"] += 1
+                    waited = time.monotonic()
+                    await queue.put(item)
+                    deadline += time.monotonic() - waited
+            except StopAsyncIteration:
+                pass
+            except asyncio.TimeoutError:
+                timing["timed_out"] = True
+                self.logger.warning(f"Source '{name}' exceeded its {budget}s budget, keeping partial results")
+            except Exception as e:
+                timing["error"] = str(e)
+                self.logger.error(f"Error collecting from source '{name}': {str(e)}")
+            finally:
+                await items.aclose()
+                timing["targets"] = collector.target_count
+                timing["failed_targets"] = list(collector.failed_targets)
+                timing["seconds"] = round(time.monotonic() - start, 2)
+                
+        async def run_all() -> None:
+            await asyncio.gather(*(run_source(name, c) for name, c in self.collectors.items()))
+            await queue.put(None)
+            
+        producer = asyncio.ensure_future(run_all())
+        try:
+            while (item := await queue.get()) is not None:
+                yield item
+            await producer
+        finally:
+            producer.cancel()
+            self.report()
+            
+    async def collect(self) -> List[Dict[str, Any]]:
+        """Collect from all sources and return the combined items."""
+        return [item async for item in self.stream()]
+        
+    @staticmethod
+    def _all_failed(timing: Dict[str, Any]) -> bool:
+        """True when the source fanned out to targets and every one of them failed."""
+        return timing["targets"] > 0 and len(timing["failed_targets"]) >= timing["targets"]
+        
+    def completed(self) -> List[str]:
+        """Sources whose last stream ran to the end, without a timeout, error or all targets failing."""
+        return [name for name, timing in self.timings.items()
+                if not timing["timed_out"] and not timing["error"] and not self._all_failed(timing)]
+                
+    def report(self) -> None:
+        """Log per-source collection timings and failed targets."""
+        for name, timing in self.timings.items():
+            if timing["timed_out"]:
+                status = "timed out"
+            elif timing["error"]:
+                status = "error"
+            elif self._all_failed(timing):
+                status = "all targets failed"
+            else:
+                status = "ok"
+            failed = timing["failed_targets"]
+            if failed and not self._all_failed(timing):
+                status += f", {len(failed)} of {timing['targets']} targets failed"
+            self.logger.info(f"Source '{name}': {timing['items']} items in {timing['seconds']}s ({status})")
+            if failed:
+                self.logger.warning(f"Source '{name}' failed targets: {', '.join(failed)}")
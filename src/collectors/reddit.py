@@ -1,67 +1,72 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from .base import BaseCollector
-from composio_llamaindex import ComposioToolSet, Action
-from llama_index.llms.openai import OpenAI
-from llama_index.core.llms import ChatMessage
-from llama_index.core.agent import FunctionCallingAgentWorker
 
 class RedditCollector(BaseCollector):
     """Collector for Reddit content."""
     
-    def __init__(self, config: Dict[str, Any]):
+    name = "reddit"
+    cursor_field = "created_utc"
+    id_field = "id"
+    # Posts below min_score when fresh may pass once they have been upvoted
+    recheck_rejected = True
+    
+    def __init__(self, config: Dict[str, Any], cursor_store=None, clients=None):
         """Initialize the Reddit collector."""
-        super().__init__(config)
-        self.llm = OpenAI(model="gpt-4o-mini")
-        self.toolset = ComposioToolSet()
-        self.tools = self.toolset.get_tools(actions=['REDDIT_RETRIEVE_REDDIT_POST'])
-        
-        # Set up agent
-        prefix_messages = [
-            ChatMessage(
-                role="system",
-                content="You are a Reddit content collector. Your task is to retrieve posts from specified subreddits."
-            )
-        ]
+        super().__init__(config, cursor_store=cursor_store, clients=clients)
         
-        self.agent = FunctionCallingAgentWorker(
-            tools=self.tools,
-            llm=self.llm,
-            prefix_messages=prefix_messages,
-            max_function_calls=10,
-            allow_parallel_tool_calls=False,
-            verbose=True
-        ).as_agent()
+    def _build_agent(self):
+        """Build a Reddit agent; each concurrent request gets its own chat history."""
+        return self.clients.agent(
+            ['REDDIT_RETRIEVE_REDDIT_POST'],
+            "You are a Reddit content collector. Your task is to retrieve posts from specified subreddits."
+        )
         
     async def collect(self) -> List[Dict[str, Any]]:
         """Collect posts from configured subreddits."""
+        return await self.fan_out(self.config["subreddits"], self._collect_subreddit)
+        
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield posts as each subreddit's request completes."""
+        async for post in self.fan_out_stream(self.config["subreddits"], self._collect_subreddit):
+            yield post
+            
+    async def _collect_subreddit(self, subreddit: str) -> List[Dict[str, Any]]:
+        """Retrieve and keyword-match the latest posts from one subreddit."""
         posts = []
-        for subreddit in self.config["subreddits"]:
-            try:
-                prompt = f"Retrieve the latest posts from the subreddit '{subreddit}'"
-                response = await self.agent.achat(prompt)
-                
-                # Process the response
-                if hasattr(response, 'response') and isinstance(response.response, dict):
-                    results = [response.response]
-                elif hasattr(response, 'response') and isinstance(response.response, list):
-                    results = response.response
-                else:
-                    results = []
+        if self.use_direct_actions:
+            data = await self.execute_action(
+                "REDDIT_RETRIEVE_REDDIT_POST",
+                {"subreddit": subreddit, "size": self.config.get("posts_per_subreddit", 25)}
+            )
+            results = self.extract_items(data)
+        else:
+            prompt = f"Retrieve the latest posts from the subreddit '{subreddit}'"
+            response = await self.agent_chat(prompt)
+            
+            # Process the response
+            if hasattr(response, 'response') and isinstance(response.response, dict):
+                results = [response.response]
+            elif hasattr(response, 'response') and isinstance(response.response, list):
+                results = response.response
+            else:
+                results = []
                 
-                # Filter posts based on keywords
-                for post in results:
-                    if any(keyword.lower() in str(post.get("title", "")).lower() or 
-                          keyword.lower() in str(post.get("selftext", "")).lower() 
-                          for keyword in self.config["keywords"]):
-                        # Add platform identifier
-                        post["platform"] = "Reddit"
-                        post["text"] = post.get("selftext", "")
-                        post["url"] = f"https://reddit.com{post.get('permalink', '')}"
-                        posts.append(post)
-            except Exception as e:
-                print(f"Error retrieving posts from r/{subreddit}: {str(e)}")
-                continue
-        return posts
+        # Filter posts based on keywords
+        for post in results:
+            if any(keyword.lower() in str(post.get("title", "")).lower() or
+                  keyword.lower() in str(post.get("selftext") or "").lower()
+                  for keyword in self.config["keywords"]):
+                # Add platform identifier
+                post["platform"] = "Reddit"
+                # Link posts report a null selftext
+                post["text"] = post.get("selftext") or ""
+                # A link post's own url points elsewhere (e.g. a repo); keep it for
+                # cross-source matching before replacing it with the permalink
+                link = post.get("url") or ""
+                post["link_url"] = link if "reddit.com" not in link else ""
+                post["url"] = f"https://reddit.com{post.get('permalink', '')}"
+                posts.append(post)
+        return self.filter_new(subreddit, posts)
     
     async def filter_content(self, content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter Reddit posts based on score and relevance."""
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Type
+import importlib
+import inspect
+import logging
+from .base import BaseCollector
+
+# Config section name -> (module, collector class); modules are imported only for enabled sources
+COLLECTORS = {
+    "reddit": ("reddit", "RedditCollector"),
+    "hackernews": ("hackernews", "HackerNewsCollector"),
+    "github": ("github", "GitHubCollector"),
+}
+
+logger = logging.getLogger(__name__)
+
+def collector_class(name: str) -> Type[BaseCollector]:
+    """Import and return the collector class registered for a source."""
+    module, class_name = COLLECTORS[name]
+    return getattr(importlib.import_module(f".{module}", __package__), class_name)
+
+def build_collectors(config: Dict[str, Any], **dependencies: Any) -> Dict[str, BaseCollector]:
+    """
+    Create a collector for every source configured and enabled in sources.yaml.
+    
+    Args:
+        config: Full sources configuration
+        dependencies: Shared stores (cursor_store, readme_cache, ...); each
+            collector receives the ones its constructor accepts
+    """
+    collectors = {}
+    for name in COLLECTORS:
+        source_config = config.get(name)
+        if not source_config or not source_config.get("enabled", True):
+            continue
+            
+        cls = collector_class(name)
+        accepted = inspect.signature(cls.__init__).parameters
+        kwargs = {key: value for key, value in dependencies.items() if key in accepted}
+        collector = cls(source_config, **kwargs)
+        if not collector.validate_config():
+            logger.error(f"Invalid configuration for source '{name}', skipping")
+            continue
+        collectors[name] = collector
+    return collectors
@@ -0,0 +1,135 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+from email.message import EmailMessage
+import asyncio
+import logging
+import os
+import re
+import yaml
+
+class BaseDelivery(ABC):
+    """Base class for delivery backends: shared templates and message formatting."""
+    
+    # Backend name used in the delivery config
+    name = "base"
+    
+    def __init__(self, config_path: str):
+        """
+        Load the email templates.
+        
+        Args:
+            config_path: Path to email templates configuration
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        with open(config_path, 'r') as f:
+            config = yaml.safe_load(f)
+            self.template = config.get('email_template', '')
+            if not self.template:
+                raise ValueError("Email template not found in configuration file")
+            self.digest_template = config.get('digest_template', '')
+            
+    @abstractmethod
+    async def send_email(self, content: Dict[str, Any], prd_content: str) -> bool:
+        """Send one opportunity with its PRD attached."""
+        pass
+        
+    @abstractmethod
+    async def send_digest(self, items: List[Tuple[Dict[str, Any], str]], recipient: str = None) -> bool:
+        """Send a whole run's opportunities in one message, one PRD attachment each."""
+        pass
+        
+    async def send_many(self, items: List[Tuple[Dict[str, Any], str]]) -> List[bool]:
+        """
+        Send one email per (content, PRD) pair concurrently.
+        
+        Backends bound the concurrency themselves, so a batch takes about as long
+        as its slowest sends. Returns each send's success in input order.
+        """
+        return list(await asyncio.gather(*(self.send_email(content, prd) for content, prd in items)))
+        
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+        
+    def _recipient(self, recipient: str = None) -> str:
+        """Explicit recipient, or EMAIL_RECIPIENT."""
+        return recipient or os.getenv('EMAIL_RECIPIENT')
+        
+    def _item_subject(self, content: Dict[str, Any]) -> str:
+        """Subject line for a single opportunity."""
+        return f"AI Agent Opportunity: {content.get('title', 'New Opportunity')}"
+        
+    def _digest_subject(self) -> str:
+        """Subject line for a run's digest."""
+        return f"AI Opportunity Alert - {datetime.now().strftime('%Y-%m-%d')}"
+        
+    def _format_item_email(self, content: Dict[str, Any]) -> str:
+        """Format a single opportunity using the email template."""
+        return self.template.format(
+            title=content.get('title', 'Untitled'),
+            platform=content.get('source', 'Unknown'),
+            relevance_score=int(content.get('relevance_score', 0) * 10),
+            summary=content.get('text', 'No summary available')[:300],
+            key_points=self._format_key_points(content.get('key_points', [])),
+            recipient=os.getenv('EMAIL_RECIPIENT', 'User')
+        )
+        
+    def _format_opportunity_email(self, opportunities: List[Dict[str, Any]], recipient: str = None) -> str:
+        """Format opportunities into email content using the digest template."""
+        template = self.digest_template
+        if not template:
+            raise ValueError("Digest template not found in configuration file")
+            
+        # Format each opportunity
+        opportunity_sections = []
+        for opp in opportunities:
+            summary = opp.get('summary') or opp.get('text') or 'No summary available'
+            section = (
+                f"Title: {opp.get('title', 'Untitled Opportunity')}\n"
+                f"Source: {opp.get('source', opp.get('platform', 'Unknown'))}\n"
+                f"Relevance Score: {int((opp.get('relevance_score') or 0) * 100)}%\n"
+                f"URL: {opp.get('url', 'No URL provided')}\n"
+                f"Summary: {summary.strip()[:500]}...\n"
+                f"Key Points:\n{self._format_key_points(opp.get('key_points', []))}\n"
+            )
+            opportunity_sections.append(section)
+            
+        # Combine all sections
+        all_opportunities = "\n\n".join(opportunity_sections)
+        
+        # Format final email
+        return template.format(
+            date=datetime.now().strftime('%Y-%m-%d'),
+            opportunities=all_opportunities,
+            total_count=len(opportunities),
+            recipient=recipient or os.getenv('EMAIL_RECIPIENT', 'User')
+        )
+        
+    def _format_key_points(self, points: List[str]) -> str:
+        """Format key points into bullet points."""
+        return "\n".join(f"- {point}" for point in points)
+        
+    def _digest_attachments(self, items: List[Tuple[Dict[str, Any], str]]) -> List[Tuple[str, str]]:
+        """One (file name, PRD) attachment per digest item."""
+        return [
+            (self._attachment_name(content, index), prd_content)
+            for index, (content, prd_content) in enumerate(items, 1)
+        ]
+        
+    def _attachment_name(self, content: Dict[str, Any], index: int) -> str:
+        """Readable, unique attachment file name for an opportunity's PRD."""
+        slug = re.sub(r'[^a-z0-9]+', '-', content.get('title', '').lower()).strip('-')[:40]
+        return f"prd_{index}_{slug or 'opportunity'}.md"
+        
+    def _build_message(self, recipient: str, subject: str, body: str, sender: str,
+                       attachments: Optional[List[Tuple[str, str]]] = None) -> EmailMessage:
+        """MIME message with markdown attachments, for backends that speak plain email."""
+        message = EmailMessage()
+        message["From"] = sender
+        message["To"] = recipient
+        message["Subject"] = subject
+        message.set_content(body)
+        for name, attachment_content in attachments or []:
+            message.add_attachment(attachment_content, subtype="markdown", filename=name)
+        return message
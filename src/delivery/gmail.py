@@ -1,57 +1,76 @@
 import dotenv
-from typing import Dict, Any, List
-from llama_index.llms.openai import OpenAI
-from llama_index.core.llms import ChatMessage
-from llama_index.core.agent import FunctionCallingAgentWorker
-from composio_llamaindex import Action, ComposioToolSet
-import yaml
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from datetime import datetime
 import os
+import asyncio
+import contextlib
+import tempfile
+from .base import BaseDelivery
+from ..clients.registry import get_clients
+from ..clients.ratelimit import estimate_tokens
 
 dotenv.load_dotenv()
 
-class GmailDelivery:
+class GmailDelivery(BaseDelivery):
     """Handle email delivery of PRDs and AI opportunity alerts."""
     
-    def __init__(self, api_key: str, config_path: str):
+    name = "gmail"
+    # LLM behind the Gmail agent
+    agent_model = "gpt-4o"
+    
+    def __init__(self, api_key: str, config_path: str, execution: str = "agent",
+                 max_concurrent_sends: int = 4, send_timeout: float = 120, clients=None):
         """
         Initialize the Gmail delivery system.
         
         Args:
             api_key: Composio API key
             config_path: Path to email templates configuration
+            execution: "agent" to send through the LLM agent, "direct" to call
+                GMAIL_SEND_EMAIL with structured parameters
+            max_concurrent_sends: Size of the pool of concurrent sends, in either mode
+            send_timeout: Seconds allowed for one send attempt; a send that times
+                out counts as failed and is retried by the outbox
+            clients: Optional ClientRegistry; the process-wide one by default
         """
-        self.llm = OpenAI(model="gpt-4o")
-        self.composio_toolset = ComposioToolSet(api_key=api_key)
-        self.tools = self.composio_toolset.get_tools(actions=['GMAIL_SEND_EMAIL'])
+        super().__init__(config_path)
+        self.execution = execution
+        self.send_semaphore = asyncio.Semaphore(max(1, max_concurrent_sends))
+        self.send_timeout = send_timeout
+        self.api_key = api_key
+        self.clients = clients or get_clients()
         
-        # Load email template (changed from templates to template)
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            self.template = config.get('email_template', '')  # Changed from email_templates
-            if not self.template:
-                raise ValueError("Email template not found in configuration file")
-            
-        self.agent = FunctionCallingAgentWorker(
-            tools=self.tools,
-            llm=self.llm,
-            prefix_messages=[
-                ChatMessage(
-                    role="system",
-                    content="You are now a integration agent, and what ever you are requested, "
-                           "you will try to execute utilizing your tools."
-                ),
-            ],
-            max_function_calls=10,
-            allow_parallel_tool_calls=False,
-            verbose=True,
-        ).as_agent()
+    @property
+    def composio_toolset(self):
+        """Composio toolset for this API key, shared with other components."""
+        return self.clients.toolset(self.api_key)
+        
+    def _build_agent(self):
+        """Build a Gmail agent; each send gets its own chat history."""
+        return self.clients.agent(
+            ['GMAIL_SEND_EMAIL'],
+            "You are now a integration agent, and what ever you are requested, "
+            "you will try to execute utilizing your tools.",
+            model=self.agent_model,
+            api_key=self.api_key
+        )
+        
+    @classmethod
+    def from_config(cls, config_path: str, config: Dict[str, Any]) -> "GmailDelivery":
+        """Build the backend from the delivery config section."""
+        return cls(
+            api_key=os.getenv("COMPOSIO_API_KEY"),
+            config_path=config_path,
+            execution=config.get("execution", "agent"),
+            max_concurrent_sends=config.get("max_concurrent_sends", 4),
+            send_timeout=config.get("send_timeout", 120)
+        )
         
     async def send_opportunity_alert(self, 
                                    recipient: str, 
                                    opportunities: List[Dict[str, Any]], 
-                                   prd_content: str = None) -> bool:
+                                   prd_content: str = None,
+                                   attachments: Optional[List[Tuple[str, str]]] = None) -> bool:
         """
         Send an email alert about new AI opportunities.
         
@@ -59,28 +78,26 @@ class GmailDelivery:
             recipient: Email recipient
             opportunities: List of opportunity dictionaries
             prd_content: Optional PRD content to attach
+            attachments: Optional (file name, content) pairs to attach
         """
         try:
             # Format email content using template
-            email_content = self._format_opportunity_email(opportunities)
-            
-            # Prepare email request
-            email_request = (
-                f"Send an email to {recipient} "
-                f"with the subject: 'AI Opportunity Alert - {datetime.now().strftime('%Y-%m-%d')}' "
-                f"and the following body:\n\n{email_content}"
-            )
-            
-            # Add attachment if PRD is provided
+            email_content = self._format_opportunity_email(opportunities, recipient)
+            attachments = list(attachments or [])
             if prd_content:
-                email_request += (
-                    f"\n\nPlease attach the following content as 'opportunity_prd.md':\n"
-                    f"{prd_content}"
-                )
-            
-            # Send email using agent
-            response = await self.agent.achat(email_request)
-            
+                attachments.insert(0, ("opportunity_prd.md", prd_content))
+                
+            # GMAIL_SEND_EMAIL attaches files by path, in either mode
+            with self._email_request(recipient, self._digest_subject(), email_content,
+                                     attachments) as email_request:
+                if self.execution == "direct":
+                    await self._execute_send(email_request)
+                else:
+                    # Send email using agent
+                    response = await self._agent_chat(
+                        f"Send this email with the attachment: {str(email_request)}"
+                    )
+                    
             logging.info(f"Email sent successfully to {recipient}")
             return True
             
@@ -88,75 +105,119 @@ class GmailDelivery:
             logging.error(f"Failed to send email: {str(e)}")
             return False
             
-    def _format_opportunity_email(self, opportunities: List[Dict[str, Any]]) -> str:
-        """Format opportunities into email content using template."""
-        template = self.template
-        
-        # Format each opportunity
-        opportunity_sections = []
-        for opp in opportunities:
-            section = (
-                f"Title: {opp.get('title', 'Untitled Opportunity')}\n"
-                f"Source: {opp.get('source', 'Unknown')}\n"
-                f"Relevance Score: {int(opp.get('relevance_score', 0) * 100)}%\n"
-                f"URL: {opp.get('url', 'No URL provided')}\n"
-                f"Summary: {opp.get('summary', 'No summary available')[:500]}...\n"
-                f"Key Points:\n{self._format_key_points(opp.get('key_points', []))}\n"
-            )
-            opportunity_sections.append(section)
-            
-        # Combine all sections
-        all_opportunities = "\n\n".join(opportunity_sections)
+    async def send_digest(self, items: List[Tuple[Dict[str, Any], str]], recipient: str = None) -> bool:
+        """
+        Send a whole run's opportunities in one email, one PRD attachment each.
         
-        # Format final email
-        return template.format(
-            date=datetime.now().strftime('%Y-%m-%d'),
-            opportunities=all_opportunities,
-            total_count=len(opportunities)
+        Args:
+            items: (content, PRD) pairs
+            recipient: Email recipient, EMAIL_RECIPIENT by default
+        """
+        return await self.send_opportunity_alert(
+            self._recipient(recipient),
+            [content for content, _ in items],
+            attachments=self._digest_attachments(items)
         )
-        
-    def _format_key_points(self, points: List[str]) -> str:
-        """Format key points into bullet points."""
-        return "\n".join(f"- {point}" for point in points)
 
     async def send_email(self, content: Dict[str, Any], prd_content: str) -> bool:
         """Send email with content and PRD."""
         try:
             # Format email using template
-            email_content = self.template.format(
-                title=content.get('title', 'Untitled'),
-                platform=content.get('source', 'Unknown'),
-                relevance_score=int(content.get('relevance_score', 0) * 10),
-                summary=content.get('text', 'No summary available')[:300],
-                key_points=self._format_key_points(content.get('key_points', [])),
-                recipient=os.getenv('EMAIL_RECIPIENT', 'User')
-            )
-
-            # Create temporary PRD file
-            temp_prd_path = "temp_prd.md"
-            with open(temp_prd_path, "w") as f:
-                f.write(prd_content)
+            email_content = self._format_item_email(content)
 
-            try:
+            # Each message gets its own temporary PRD file, so concurrent sends never collide
+            with self._attachment_file("prd.md", prd_content) as prd_path:
                 # Prepare email request
                 email_request = {
                     "recipient_email": os.getenv('EMAIL_RECIPIENT'),
-                    "subject": f"AI Agent Opportunity: {content.get('title', 'New Opportunity')}",
+                    "subject": self._item_subject(content),
                     "body": email_content,
-                    "attachment": temp_prd_path  # Use file path instead of content directly
+                    "attachment": prd_path  # Use file path instead of content directly
                 }
 
-                # Send email using agent
-                response = await self.agent.achat(
-                    f"Send this email with the attachment: {str(email_request)}"
-                )
-                
+                if self.execution == "direct":
+                    await self._execute_send(email_request)
+                else:
+                    # Send email using agent
+                    response = await self._agent_chat(
+                        f"Send this email with the attachment: {str(email_request)}"
+                    )
+                    
                 return True
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_prd_path):
-                    os.remove(temp_prd_path)
                 
         except Exception as e:
             logging.error(f"Failed to send email: {str(e)}")
-            return False 
\ No newline at end of file
+            return False 
+            
+    @contextlib.contextmanager
+    def _attachment_file(self, name: str, content: str):
+        """Write an attachment under its own name in a private temporary directory."""
+        with tempfile.TemporaryDirectory(prefix="ai_alpha_") as directory:
+            path = os.path.join(directory, name)
+            with open(path, "w") as f:
+                f.write(content)
+            yield path
+            
+    async def _agent_chat(self, message: str) -> Any:
+        """
+        Run one request through a fresh Gmail agent within the gpt-4o rate limit.
+        
+        Agents share the tools and LLM underneath, so agent sends run on the
+        same pool as direct ones. The attempt is bounded by send_timeout. Not
+        retried on rate-limit errors: the agent may already have sent the email.
+        """
+        async with self.send_semaphore:
+            limiter = self.clients.limiter("openai", self.agent_model)
+            return await limiter.run(
+                lambda: asyncio.wait_for(self._build_agent().achat(message), self.send_timeout),
+                estimate_tokens(message, completion=1000), retry=False
+            )
+                                     
+    @contextlib.contextmanager
+    def _email_request(self, recipient: str, subject: str, body: str,
+                       attachments: Optional[List[Tuple[str, str]]] = None):
+        """
+        GMAIL_SEND_EMAIL parameters, with any attachment written to a temporary file.
+        
+        GMAIL_SEND_EMAIL takes a single attachment, so several attachments are
+        bundled into one markdown file with a section per original file.
+        """
+        email_request = {
+            "recipient_email": recipient,
+            "subject": subject,
+            "body": body
+        }
+        if not attachments:
+            yield email_request
+            return
+            
+        if len(attachments) == 1:
+            attachment_name, attachment_content = attachments[0]
+        else:
+            attachment_name = "opportunity_prds.md"
+            attachment_content = "\n\n---\n\n".join(
+                f"<!-- {name} -->\n{content}" for name, content in attachments
+            )
+            
+        with self._attachment_file(attachment_name, attachment_content) as path:
+            email_request["attachment"] = path
+            yield email_request
+            
+    async def _execute_send(self, params: Dict[str, Any]) -> Any:
+        """Execute GMAIL_SEND_EMAIL directly, without an LLM in the loop; each attempt is bounded by send_timeout."""
+        async def call():
+            result = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self.composio_toolset.execute_action,
+                    action=self.clients.action("GMAIL_SEND_EMAIL"),
+                    params=params
+                ),
+                self.send_timeout
+            )
+            if not result.get("successful", result.get("successfull", True)):
+                raise RuntimeError(result.get("error") or "GMAIL_SEND_EMAIL failed")
+            return result.get("data", result)
+            
+        # A rejected (429) send delivered nothing, so it is safe to retry
+        async with self.send_semaphore:
+            return await self.clients.limiter("composio").run(call)
\ No newline at end of file
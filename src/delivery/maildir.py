@@ -0,0 +1,69 @@
+from typing import Dict, Any, List, Tuple
+from email.message import EmailMessage
+import asyncio
+import mailbox
+import os
+from .base import BaseDelivery
+
+class MaildirDelivery(BaseDelivery):
+    """Write PRD emails to a local Maildir instead of sending them."""
+    
+    name = "maildir"
+    
+    def __init__(self, config_path: str, config: Dict[str, Any]):
+        """
+        Initialize the Maildir sink.
+        
+        Args:
+            config_path: Path to email templates configuration
+            config: Sink settings (path, sender)
+        """
+        super().__init__(config_path)
+        self.path = config.get("path", "data/maildir")
+        self.sender = config.get("sender", "ai-alpha-agent@localhost")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.maildir = mailbox.Maildir(self.path, create=True)
+        
+    @classmethod
+    def from_config(cls, config_path: str, config: Dict[str, Any]) -> "MaildirDelivery":
+        """Build the backend from the delivery config section."""
+        return cls(config_path, config.get("maildir", {}))
+        
+    def _write(self, messages: List[EmailMessage]) -> List[bool]:
+        """Add messages to the Maildir (runs in a worker thread)."""
+        results = []
+        for message in messages:
+            try:
+                self.maildir.add(message)
+                results.append(True)
+            except OSError as e:
+                self.logger.error(f"Failed to write '{message['Subject']}' to {self.path}: {str(e)}")
+                results.append(False)
+        return results
+        
+    async def send_many(self, items: List[Tuple[Dict[str, Any], str]]) -> List[bool]:
+        """Write one message per (content, PRD) pair."""
+        messages = [
+            self._build_message(
+                self._recipient() or "", self._item_subject(content), self._format_item_email(content),
+                self.sender, [("prd.md", prd_content)]
+            )
+            for content, prd_content in items
+        ]
+        return await asyncio.to_thread(self._write, messages)
+        
+    async def send_email(self, content: Dict[str, Any], prd_content: str) -> bool:
+        """Write one opportunity with its PRD attached."""
+        return (await self.send_many([(content, prd_content)]))[0]
+        
+    async def send_digest(self, items: List[Tuple[Dict[str, Any], str]], recipient: str = None) -> bool:
+        """Write a whole run's opportunities as one message, one PRD attachment each."""
+        recipient = self._recipient(recipient) or ""
+        message = self._build_message(
+            recipient, self._digest_subject(),
+            self._format_opportunity_email([content for content, _ in items], recipient),
+            self.sender, self._digest_attachments(items)
+        )
+        return (await asyncio.to_thread(self._write, [message]))[0]
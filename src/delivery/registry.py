@@ -0,0 +1,28 @@
+from typing import Any, Dict, Type
+import importlib
+from .base import BaseDelivery
+
+# delivery.backend value -> (module, backend class); only the selected backend is imported
+DELIVERY_BACKENDS = {
+    "gmail": ("gmail", "GmailDelivery"),
+    "smtp": ("smtp", "SMTPDelivery"),
+    "maildir": ("maildir", "MaildirDelivery"),
+}
+
+def backend_class(backend: str) -> Type[BaseDelivery]:
+    """Import and return the delivery backend class registered under a name."""
+    module, class_name = DELIVERY_BACKENDS[backend]
+    return getattr(importlib.import_module(f".{module}", __package__), class_name)
+
+def build_delivery(config: Dict[str, Any], config_path: str = "config/templates.yaml") -> BaseDelivery:
+    """
+    Create the delivery backend selected in sources.yaml.
+    
+    Args:
+        config: The delivery config section
+        config_path: Path to email templates configuration
+    """
+    backend = config.get("backend", "gmail")
+    if backend not in DELIVERY_BACKENDS:
+        raise ValueError(f"Unknown delivery backend '{backend}', expected one of: {', '.join(DELIVERY_BACKENDS)}")
+    return backend_class(backend).from_config(config_path, config)
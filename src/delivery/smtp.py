@@ -0,0 +1,120 @@
+from typing import Dict, Any, List, Tuple
+from email.message import EmailMessage
+import asyncio
+import os
+import smtplib
+from .base import BaseDelivery
+
+class SMTPDelivery(BaseDelivery):
+    """Deliver PRDs over SMTP, reusing one authenticated connection per batch."""
+    
+    name = "smtp"
+    
+    def __init__(self, config_path: str, config: Dict[str, Any]):
+        """
+        Initialize the SMTP backend.
+        
+        Args:
+            config_path: Path to email templates configuration
+            config: SMTP settings (host, port, starttls, ssl, timeout, sender);
+                credentials come from SMTP_USERNAME and SMTP_PASSWORD
+        """
+        super().__init__(config_path)
+        self.host = config.get("host", "localhost")
+        self.port = config.get("port", 587)
+        self.starttls = config.get("starttls", True)
+        self.ssl = config.get("ssl", False)
+        self.timeout = config.get("timeout", 30)
+        self.username = os.getenv("SMTP_USERNAME")
+        self.password = os.getenv("SMTP_PASSWORD")
+        self.sender = config.get("sender") or self.username or "ai-alpha-agent@localhost"
+        
+    @classmethod
+    def from_config(cls, config_path: str, config: Dict[str, Any]) -> "SMTPDelivery":
+        """Build the backend from the delivery config section."""
+        return cls(config_path, config.get("smtp", {}))
+        
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate one SMTP connection."""
+        if self.ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+        
+    def _send_batch(self, messages: List[EmailMessage]) -> List[bool]:
+        """
+        Send messages over a single connection (runs in a worker thread).
+        
+        A rejected message fails alone. A dropped connection or timeout fails
+        the message in flight and the ones after it; messages already sent
+        stay reported as sent, so the outbox does not send them twice.
+        """
+        results = []
+        smtp = self._connect()
+        try:
+            for message in messages:
+                try:
+                    smtp.send_message(message)
+                    results.append(True)
+                except smtplib.SMTPException as e:
+                    self.logger.error(f"Failed to send '{message['Subject']}': {str(e)}")
+                    results.append(False)
+                except OSError as e:
+                    self.logger.error(f"SMTP connection lost sending '{message['Subject']}': {str(e)}")
+                    break
+        finally:
+            try:
+                smtp.quit()
+            except (OSError, smtplib.SMTPException):
+                smtp.close()
+        return results + [False] * (len(messages) - len(results))
+        
+    async def _send(self, messages: List[EmailMessage]) -> List[bool]:
+        """Send a batch off the event loop; a connection failure fails the whole batch."""
+        try:
+            return await asyncio.to_thread(self._send_batch, messages)
+        except (OSError, smtplib.SMTPException) as e:
+            self.logger.error(f"SMTP connection to {self.host}:{self.port} failed: {str(e)}")
+            return [False] * len(messages)
+            
+    def _missing_recipient(self, recipient: str) -> bool:
+        """Log and report a send that has nobody to go to."""
+        if recipient:
+            return False
+        self.logger.error("No recipient configured; set EMAIL_RECIPIENT")
+        return True
+        
+    async def send_many(self, items: List[Tuple[Dict[str, Any], str]]) -> List[bool]:
+        """Send one email per (content, PRD) pair over a single connection."""
+        recipient = self._recipient()
+        if self._missing_recipient(recipient):
+            return [False] * len(items)
+        messages = [
+            self._build_message(
+                recipient, self._item_subject(content), self._format_item_email(content),
+                self.sender, [("prd.md", prd_content)]
+            )
+            for content, prd_content in items
+        ]
+        return await self._send(messages) if messages else []
+        
+    async def send_email(self, content: Dict[str, Any], prd_content: str) -> bool:
+        """Send one opportunity with its PRD attached."""
+        return (await self.send_many([(content, prd_content)]))[0]
+        
+    async def send_digest(self, items: List[Tuple[Dict[str, Any], str]], recipient: str = None) -> bool:
+        """Send a whole run's opportunities in one message, one PRD attachment each."""
+        recipient = self._recipient(recipient)
+        if self._missing_recipient(recipient):
+            return False
+        message = self._build_message(
+            recipient, self._digest_subject(),
+            self._format_opportunity_email([content for content, _ in items], recipient),
+            self.sender, self._digest_attachments(items)
+        )
+        return (await self._send([message]))[0]
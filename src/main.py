@@ -1,115 +1,488 @@
+import time
+_import_started = time.perf_counter()
+
 import os
+import sys
+import argparse
 import asyncio
+import hashlib
+import json
+import random
 import yaml
 from dotenv import load_dotenv
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from collectors.github import GitHubCollector
-from analysis.filter import ContentFilter
-from templates.prd import PRDGenerator
-from delivery.gmail import GmailDelivery
+from .collectors.registry import COLLECTORS, build_collectors, collector_class
+from .collectors.orchestrator import SourceOrchestrator
+from .analysis.filter import ContentFilter
+from .analysis.dedup import Deduplicator
+from .analysis.ranking import top_k
+from .templates.prd import PRDGenerator
+from .delivery.registry import DELIVERY_BACKENDS, build_delivery
+from .storage.cache import SQLiteCache
+from .storage.state import CursorStore
+from .storage.seen import SeenStore, canonical_url
+from .storage.outbox import Outbox
+from .pipeline import Pipeline, Stage
+from .clients.registry import get_clients
 import logging
 
+# Heavy client libraries (llama_index, composio, apscheduler) are imported on first use
+IMPORT_SECONDS = time.perf_counter() - _import_started
+
 class AIAlphaAgent:
     """Main application class for AI Alpha Agent."""
     
-    def __init__(self):
-        """Initialize the AI Alpha Agent."""
+    def __init__(self, config_path: str = "config/sources.yaml", dry_run: bool = False):
+        """
+        Initialize the AI Alpha Agent.
+        
+        Args:
+            config_path: Path to the sources configuration
+            dry_run: Leave live state untouched (cursors, seen-item retention, outbox)
+                so a later real run sees the same items
+        """
         load_dotenv()
+        self.dry_run = dry_run
         
         # Set up logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
         # Load configurations
-        with open("config/sources.yaml", "r") as f:
+        with open(config_path, "r") as f:
             self.config = yaml.safe_load(f)
             
+        # One shared quota per provider and model for every LLM and Composio caller
+        get_clients().configure_rate_limits(self.config.get("rate_limits", {}))
+        
         # Initialize components
-        self.github_collector = GitHubCollector(self.config["github"])
+        state_config = self.config.get("state", {})
+        self.cursor_store = CursorStore(state_config.get("path", "data/state.sqlite3"))
+        self.seen_store = SeenStore.from_config(state_config.get("seen", {}))
+        self.deduplicator = Deduplicator(self.config.get("dedup", {}), canonicalize=canonical_url)
+        readme_cache = SQLiteCache.from_config(self.config.get("github", {}).get("readme_cache", {}), namespace="readme")
+        self.collectors = build_collectors(
+            self.config,
+            readme_cache=readme_cache,
+            cursor_store=None if dry_run else self.cursor_store
+        )
+        self.orchestrator = SourceOrchestrator(self.collectors, self.config.get("orchestrator", {}))
         
         # Content filtering
+        filter_config = self.config.get("filters", {})
         self.content_filter = ContentFilter({
-            "min_relevance_score": 0.7,
-            "max_repos_per_batch": 3
-        })
+            **filter_config,
+            "min_relevance_score": filter_config.get("relevance_threshold", 0.7)
+        }, score_cache=SQLiteCache.from_config(filter_config.get("score_cache", {}), namespace="scores"))
         
-        self.prd_generator = PRDGenerator("config/templates.yaml")
-        self.email_delivery = GmailDelivery(
-            api_key=os.getenv("COMPOSIO_API_KEY"),
-            config_path="config/templates.yaml"
-        )
+        prd_config = self.config.get("prd", {})
+        self.prd_cache = SQLiteCache.from_config(prd_config.get("cache", {}), namespace="prd")
+        self.prd_generator = PRDGenerator("config/templates.yaml", prd_config, cache=self.prd_cache)
+        self.email_delivery = build_delivery(self.config.get("delivery", {}), "config/templates.yaml")
+        # Dry runs never deliver, so they do not open the outbox at all
+        self.outbox = None if dry_run else Outbox.from_config(self.config.get("delivery", {}).get("outbox", {}))
         
-    async def process_content(self, content: dict) -> bool:
-        """Process a single repository."""
-        try:
-            self.logger.info(f"Generating PRD for: {content.get('title', 'Untitled')}")
+    def _prepare_content(self, content: dict) -> dict:
+        """Return a copy of the item enriched for PRD generation and email."""
+        # Work on a copy so the seen-item store records the collected content
+        content = dict(content)
+        content.pop("members", None)
+        
+        # Add repository details to content
+        content["key_points"] = [
+            f"Stars: {content.get('stars', 0)}",
+            f"Language: {content.get('language', 'Unknown')}",
+            f"Topics: {', '.join(content.get('topics', []))}",
+            f"Last updated: {content.get('updated_at', 'Unknown')}"
+        ]
+        
+        # Generate PRD using both description and README
+        content["text"] = f"""
+        Description: {content.get('text', '')}
+        
+        README:
+        {content.get('readme', '')}
+        """
+        return content
+        
+    def _item_key(self, item: dict) -> str:
+        """Identity of an item's content, so changed content can be delivered again."""
+        identity = canonical_url(item.get("url", "")) or f"{item.get('platform', '')}:{item.get('title', '')}"
+        content = " ".join(str(item.get(field) or "") for field in ("title", "text", "readme"))
+        return f"{identity}#{hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]}"
+        
+    def _enqueue(self, originals: list, payload: dict) -> bool:
+        """Queue a message in the outbox and record its items as processed."""
+        item_key = "+".join(sorted(self._item_key(original) for original in originals))
+        if self.outbox.enqueue(item_key, os.getenv("EMAIL_RECIPIENT", ""), payload):
+            self.logger.info(f"Queued {payload['kind']} message for delivery")
+        else:
+            self.logger.info(f"Skipped {payload['kind']} message already in the outbox")
+        # The outbox is durable, so the items will not need a new PRD next run
+        self._mark_processed(originals)
+        return True
+        
+    async def _deliver(self, original: dict, content: dict, prd_content: str) -> bool:
+        """Email a generated PRD and record the item as processed."""
+        if self.outbox:
+            return self._enqueue([original], {"kind": "item", "content": content, "prd": prd_content})
+            
+        self.logger.info(f"Sending email for: {content.get('title', 'Untitled')}")
+        success = await self.email_delivery.send_email(content, prd_content)
+        
+        if success:
+            self.logger.info("Email sent successfully")
+            self._mark_processed([original])
+        else:
+            self.logger.error("Failed to send email")
+            self._hold_back([original])
+        return success
+        
+    async def _deliver_digest(self, jobs: list) -> bool:
+        """Email a whole run's PRDs in one digest and record the items as processed."""
+        if self.outbox:
+            return self._enqueue(
+                [original for original, _, _ in jobs],
+                {"kind": "digest", "items": [[content, prd] for _, content, prd in jobs]}
+            )
             
-            # Add repository details to content
-            content["key_points"] = [
-                f"Stars: {content.get('stars', 0)}",
-                f"Language: {content.get('language', 'Unknown')}",
-                f"Topics: {', '.join(content.get('topics', []))}",
-                f"Last updated: {content.get('updated_at', 'Unknown')}"
-            ]
+        self.logger.info(f"Sending digest of {len(jobs)} opportunities")
+        success = await self.email_delivery.send_digest([(content, prd) for _, content, prd in jobs])
+        
+        if success:
+            self.logger.info("Digest sent successfully")
+            self._mark_processed([original for original, _, _ in jobs])
+        else:
+            self.logger.error("Failed to send digest")
+            self._hold_back([original for original, _, _ in jobs])
+        return success
+        
+    @staticmethod
+    def _members(originals: list) -> list:
+        """Every collected item behind the given items, including merged duplicates."""
+        return [member for original in originals for member in original.get("members", [original])]
+        
+    def _mark_processed(self, originals: list) -> None:
+        """Record items and their merged duplicates, so none of them comes back as new."""
+        if self.seen_store:
+            for member in self._members(originals):
+                self.seen_store.mark_processed(member)
+                
+    def _hold_back(self, originals: list) -> None:
+        """Keep the collection cursors below items that were not delivered, so they are collected again."""
+        for member in self._members(originals):
+            collector = self.collectors.get(member.get("collector"))
+            if collector:
+                collector.hold_back(member)
+                
+    async def _send_messages(self, messages: list) -> list:
+        """Send claimed outbox messages; single-item messages go out as one batch."""
+        items = [m for m in messages if m["payload"]["kind"] == "item"]
+        digests = [m for m in messages if m["payload"]["kind"] == "digest"]
+        
+        async def send_items():
+            if not items:
+                return []
+            return await self.email_delivery.send_many(
+                [(m["payload"]["content"], m["payload"]["prd"]) for m in items]
+            )
             
-            # Generate PRD using both description and README
-            content["text"] = f"""
-            Description: {content.get('text', '')}
+        results = await asyncio.gather(
+            send_items(),
+            *(self.email_delivery.send_digest([tuple(item) for item in m["payload"]["items"]]) for m in digests),
+            return_exceptions=True
+        )
+        item_results = results[0] if not isinstance(results[0], Exception) else [results[0]] * len(items)
+        outcome = dict(zip((m["id"] for m in items), item_results))
+        outcome.update(zip((m["id"] for m in digests), results[1:]))
+        return [outcome[m["id"]] for m in messages]
+        
+    async def drain_outbox(self) -> int:
+        """Send every due outbox message once; returns how many were sent."""
+        sent = 0
+        batch_size = self.config.get("delivery", {}).get("outbox", {}).get("batch_size", 10)
+        while True:
+            messages = self.outbox.claim(batch_size)
+            if not messages:
+                return sent
+            # A claimed batch is sent concurrently on the delivery pool
+            results = await self._send_messages(messages)
+            for message, result in zip(messages, results):
+                if result is True:
+                    self.outbox.mark_sent(message["id"])
+                    sent += 1
+                    continue
+                error = str(result) if isinstance(result, Exception) else "Delivery reported failure"
+                if not self.outbox.mark_failed(message["id"], error):
+                    self.logger.warning(f"Delivery failed (attempt {message['attempts'] + 1}), will retry: {error}")
+                    
+    async def run_outbox_worker(self):
+        """Drain the outbox in the background, independently of scanning."""
+        interval = self.config.get("delivery", {}).get("outbox", {}).get("poll_interval", 30)
+        while True:
+            try:
+                sent = await self.drain_outbox()
+                if sent:
+                    self.logger.info(f"Delivered {sent} outbox messages: {self.outbox.stats()}")
+            except Exception as e:
+                self.logger.error(f"Error draining outbox: {str(e)}")
+            await asyncio.sleep(interval)
             
-            README:
-            {content.get('readme', '')}
-            """
+    def _build_pipeline(self, selected: list = None) -> Pipeline:
+        """
+        Build the collect -> dedup -> score -> PRD -> deliver pipeline for one run.
+        
+        When a selected list is given the pipeline stops after scoring and
+        appends the selected items to it instead (no PRDs, no email).
+        """
+        pipeline_config = self.config.get("pipeline", {})
+        workers = pipeline_config.get("workers", {})
+        queue_size = pipeline_config.get("queue_size", 10)
+        filters = self.config["filters"]
+        use_cascade = filters.get("cascade", {}).get("enabled", False)
+        digest_mode = self.config.get("delivery", {}).get("mode", "per_item") == "digest"
+        digest = []
+        candidates = []
+        
+        async def dedup(item: dict):
+            # Skip repositories already turned into PRDs, before any LLM work
+            if self.seen_store and not self.seen_store.is_new(item):
+                return None
+            # Apply the source's own filter first, so a weak duplicate that arrives
+            # early (e.g. a low-point HN post linking a repo) cannot displace a good item.
+            # Replayed or synthetic items may come from a source that is not enabled.
+            collector = self.collectors.get(item.get("collector"))
+            if collector and not await collector.admit(item):
+                return None
+            # Collapse the same idea seen on several sources into one item
+            return self.deduplicator.add(item)
             
-            prd_content = await self.prd_generator.generate_prd(content)
+        async def score(item: dict):
+            # Held until every source is done, so the cascade can rank the whole run
+            # and dedup can still swap in a richer duplicate's content. Scoring and
+            # selection run once in select(), so this stage needs a single worker,
+            # and PRD work starts only after the slowest source has finished.
+            candidates.append(item)
+            return None
             
-            self.logger.info("Sending email...")
-            success = await self.email_delivery.send_email(content, prd_content)
+        async def select():
+            # One cascade call: the cheap tier ranks everything, and the LLM budget
+            # goes to the run's top_k and borderline items in batched requests
+            scored = await self.content_filter.score_cascade(candidates) if use_cascade else candidates
+            # Keep the best items across all sources rather than the first to arrive
+            selected = top_k(scored, filters["max_repos_per_batch"])
+            for item in selected:
+                self.logger.info(f"Processing repository: {item.get('title', 'Untitled')}")
+            return selected
             
-            if success:
-                self.logger.info("Email sent successfully")
-            else:
-                self.logger.error("Failed to send email")
+        async def prd(item: dict):
+            prepared = self._prepare_content(item)
+            self.logger.info(f"Generating PRD for: {prepared.get('title', 'Untitled')}")
+            try:
+                return item, prepared, await self.prd_generator.generate_prd(prepared)
+            except Exception:
+                # Nothing is delivered or marked seen, and the item is collected again
+                self._hold_back([item])
+                raise
                 
-            return success
-        except Exception as e:
-            self.logger.error(f"Error processing content: {str(e)}")
-            return False
+        async def deliver(job: tuple):
+            if digest_mode:
+                # Held until the run ends so everything goes out in one email
+                digest.append(job)
+            else:
+                await self._deliver(*job)
+            return None
             
-    async def scan_and_process(self):
-        """Scan GitHub and process repositories."""
-        try:
-            self.logger.info("Starting GitHub scan...")
+        async def send_digest():
+            if digest:
+                await self._deliver_digest(digest)
+            return []
+            
+        async def report(item: dict):
+            selected.append(item)
+            return None
+            
+        if selected is not None:
+            return Pipeline([
+                Stage("dedup", dedup, workers.get("dedup", 1), queue_size),
+                Stage("score", score, 1, queue_size, flush=select),
+                Stage("report", report, 1, queue_size),
+            ])
+            
+        return Pipeline([
+            Stage("dedup", dedup, workers.get("dedup", 1), queue_size),
+            Stage("score", score, 1, queue_size, flush=select),
+            Stage("prd", prd, workers.get("prd", 2), queue_size),
+            Stage("deliver", deliver, workers.get("deliver", 4), queue_size,
+                  flush=send_digest if digest_mode else None),
+        ])
+        
+    @staticmethod
+    def _stages_that_lost_items(stats: dict) -> list:
+        """
+        Stages whose handler or flush failed, dropping items without holding them back.
+        
+        A failed PRD holds its item back itself, so only the other stages count.
+        """
+        return [name for name, counters in stats.items()
+                if name != "prd" and (counters["failed"] or counters["flush_failed"])]
+                
+    def _start_run(self) -> None:
+        """Reset per-run state before items start flowing."""
+        if self.seen_store and not self.dry_run:
+            self.seen_store.prune()
+        self.deduplicator.reset()
+        self.content_filter.reset_budget()
+        for collector in self.collectors.values():
+            collector.discard_cursors()
             
-            # Collect repositories
-            repositories = await self.github_collector.collect()
-            self.logger.info(f"Found {len(repositories)} repositories")
+    async def select(self, source=None) -> tuple:
+        """
+        Run collection, dedup and scoring only, without PRDs or email.
+        
+        Args:
+            source: Async iterator of items; all enabled sources by default
             
-            # Filter repositories
-            filtered_repos = await self.github_collector.filter_content(repositories)
-            self.logger.info(f"Filtered to {len(filtered_repos)} relevant repositories")
+        Returns:
+            The selected items, best first, and the per-stage pipeline stats
+        """
+        self._start_run()
+        selected = []
+        stats = await self._build_pipeline(selected).run(source or self.orchestrator.stream())
+        return selected, stats
+        
+    async def scan_and_process(self, source=None):
+        """
+        Scan all enabled sources and process the best items.
+        
+        Args:
+            source: Async iterator of items to process instead of scanning,
+                e.g. items replayed from a file
+        """
+        try:
+            scanning = source is None
+            if scanning:
+                self.logger.info(f"Starting scan of: {', '.join(self.collectors)}")
+                source = self.orchestrator.stream()
+            self._start_run()
             
-            # Take only the top repositories
-            top_repos = filtered_repos[:self.config["filters"]["max_repos_per_batch"]]
+            # Items flow through the stages as soon as any source produces them
+            stats = await self._build_pipeline().run(source)
             
-            # Process each repository
-            for repo in top_repos:
-                self.logger.info(f"Processing repository: {repo.get('title', 'Untitled')}")
-                await self.process_content(repo)
+            if scanning:
+                lost = self._stages_that_lost_items(stats)
+                if lost:
+                    # Nothing tells which items were dropped, so collect them all again;
+                    # the seen-item store skips the ones that were delivered
+                    self.logger.error(f"Items were lost in stage(s) {', '.join(lost)}; "
+                                      f"collection cursors are not advanced")
+                    for collector in self.collectors.values():
+                        collector.discard_cursors()
+                else:
+                    # Every collected item is now scored and delivered or queued, so the
+                    # cursors of sources that finished collecting can move past them
+                    for name in self.orchestrator.completed():
+                        self.collectors[name].commit_cursors()
+                    
+            if self.prd_cache:
+                self.logger.info(f"PRD cache stats: {self.prd_cache.stats()}")
+            score_stats = self.content_filter.score_cache_stats()
+            if score_stats:
+                self.logger.info(f"Score cache stats: {score_stats}")
+            if self.outbox:
+                self.logger.info(f"Outbox stats: {self.outbox.stats()}")
+            rate_stats = get_clients().rate_limit_stats()
+            if rate_stats:
+                self.logger.info(f"Rate limiter stats: {rate_stats}")
                 
         except Exception as e:
             self.logger.error(f"Error in scan_and_process: {str(e)}")
 
-async def run_agent():
+async def read_items(path: str):
+    """Yield items recorded as JSON lines."""
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+async def record_items(source, path: str):
+    """Pass items through while appending each one to a JSON lines file."""
+    with open(path, "w") as f:
+        async for item in source:
+            f.write(json.dumps(item, default=str) + "\n")
+            yield item
+
+async def iterate(items: list):
+    """Async iterator over an in-memory list of items."""
+    for item in items:
+        yield item
+
+def synthetic_items(count: int, seed: int = 0) -> list:
+    """Random posts with a realistic mix of relevant, irrelevant and duplicate content."""
+    rng = random.Random(seed)
+    topics = ["AI agent framework", "autonomous agent", "LLM agent", "multi-agent system",
+              "sourdough recipe", "GPU benchmark", "web framework", "database migration"]
+    words = ("tool memory planning open source release python api workflow benchmark "
+             "production self-hosted browser coding research").split()
+    items = []
+    for i in range(count):
+        base = i if rng.random() > 0.1 else rng.randrange(max(i, 1))  # ~10% reposts
+        topic = topics[base % len(topics)]
+        text = " ".join(rng.sample(words, 8))
+        items.append({
+            "id": str(i),
+            "title": f"{topic} #{base}",
+            "text": f"{topic}: {text}",
+            "url": f"https://example.org/posts/{base}",
+            "platform": "Bench",
+            "score": rng.randint(0, 2000),
+            "created_utc": time.time() - rng.randint(0, 20 * 86400)
+        })
+    return items
+
+def validate_config(config_path: str, templates_path: str = "config/templates.yaml") -> list:
+    """Check the configuration without contacting any service; returns a list of problems."""
+    try:
+        with open(config_path, "r") as f:
+            config = yaml.safe_load(f) or {}
+        with open(templates_path, "r") as f:
+            templates = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        return [f"Cannot load configuration: {str(e)}"]
+        
+    problems = []
+    enabled = [name for name in COLLECTORS if config.get(name) and config[name].get("enabled", True)]
+    if not enabled:
+        problems.append("No source is enabled")
+    for name in enabled:
+        if not collector_class(name)(config[name]).validate_config():
+            problems.append(f"Source '{name}' is missing required settings")
+    if "max_repos_per_batch" not in config.get("filters", {}):
+        problems.append("filters.max_repos_per_batch is required")
+        
+    delivery = config.get("delivery", {})
+    if delivery.get("backend", "gmail") not in DELIVERY_BACKENDS:
+        problems.append(f"Unknown delivery backend '{delivery.get('backend')}'")
+    if not templates.get("email_template"):
+        problems.append("email_template is missing from the templates")
+    if delivery.get("mode") == "digest" and not templates.get("digest_template"):
+        problems.append("digest_template is required in digest mode")
+    return problems
+
+async def run_agent(agent: AIAlphaAgent = None):
     """Run the agent with scheduler."""
-    agent = AIAlphaAgent()
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    agent = agent or AIAlphaAgent()
     
     # Set up scheduler for daily runs
     scheduler = AsyncIOScheduler()
     scheduler.add_job(agent.scan_and_process, 'interval', hours=24)
     
+    # Delivery runs at its own pace; scans only queue messages
+    outbox_worker = asyncio.ensure_future(agent.run_outbox_worker()) if agent.outbox else None
+    
     try:
         scheduler.start()
-        print("Agent started. Scanning GitHub daily...")
+        print("Agent started. Scanning sources daily...")
         # Run initial scan
         await agent.scan_and_process()
         # Keep running
@@ -117,7 +490,103 @@ async def run_agent():
             await asyncio.sleep(1)
     except (KeyboardInterrupt, SystemExit):
         scheduler.shutdown()
+        if outbox_worker:
+            outbox_worker.cancel()
         print("\nAgent stopped.")
 
+async def run_once(agent: AIAlphaAgent, source=None) -> None:
+    """Run a single scan (or replay) and deliver whatever it queued."""
+    await agent.scan_and_process(source)
+    if agent.outbox:
+        sent = await agent.drain_outbox()
+        agent.logger.info(f"Delivered {sent} outbox messages: {agent.outbox.stats()}")
+
+async def dry_run(agent: AIAlphaAgent, save_path: str = None, source=None) -> None:
+    """Collect (or replay) and select items, print the selection and send nothing."""
+    source = source or agent.orchestrator.stream()
+    if save_path:
+        source = record_items(source, save_path)
+    selected, _ = await agent.select(source)
+    print(f"Selected {len(selected)} items:")
+    for item in selected:
+        print(f"  {item.get('relevance_score') or 0:.2f}  [{item.get('collector', '?')}] "
+              f"{item.get('title', 'Untitled')}  {item.get('url', '')}")
+
+async def bench(agent: AIAlphaAgent, count: int, path: str = None) -> None:
+    """Measure dedup, scoring and selection throughput without any network calls."""
+    items = [item async for item in read_items(path)] if path else synthetic_items(count)
+    agent.content_filter.config.setdefault("cascade", {})["max_llm_calls"] = 0
+    agent.seen_store = None
+    
+    started = time.perf_counter()
+    selected, stats = await agent.select(iterate(items))
+    elapsed = time.perf_counter() - started
+    print(f"Processed {len(items)} items in {elapsed:.2f}s ({len(items) / max(elapsed, 1e-9):.0f} items/s), "
+          f"selected {len(selected)}")
+    for name, counters in stats.items():
+        print(f"  {name:<8} received {counters['received']:>6}  emitted {counters['emitted']:>6}  "
+              f"failed {counters['failed']:>4}  busy {counters['busy_seconds']:.3f}s")
+
+def main(argv: list = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(prog="ai-alpha-agent", description="Find AI agent opportunities and email PRDs.")
+    parser.add_argument("--config", default="config/sources.yaml", help="Sources configuration file")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Scan daily on a schedule and keep delivering (default)")
+    commands.add_parser("run-once", help="Run one scan, deliver what it queued and exit")
+    dry = commands.add_parser("dry-run", help="Collect and select items without generating PRDs or sending email")
+    dry.add_argument("--save", help="Record the collected items as JSON lines for replay or bench")
+    commands.add_parser("check", help="Validate the configuration and exit")
+    bench_parser = commands.add_parser("bench", help="Measure selection throughput offline")
+    bench_parser.add_argument("--items", type=int, default=1000, help="Number of synthetic items")
+    bench_parser.add_argument("--file", help="Use items recorded by dry-run --save instead")
+    replay = commands.add_parser("replay", help="Process items recorded by dry-run --save")
+    replay.add_argument("file", help="JSON lines file of recorded items")
+    replay.add_argument("--dry-run", action="store_true", help="Only select, without PRDs or email")
+    commands.add_parser("requeue-dead", help="Give dead-lettered outbox messages a fresh set of attempts")
+    args = parser.parse_args(argv)
+    command = args.command or "run"
+    
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+    logger.info(f"Imported in {IMPORT_SECONDS * 1000:.0f} ms")
+    
+    if command == "check":
+        problems = validate_config(args.config)
+        for problem in problems:
+            print(f"Configuration error: {problem}")
+        print("Configuration OK" if not problems else f"{len(problems)} configuration error(s)")
+        return 1 if problems else 0
+        
+    if command == "requeue-dead":
+        with open(args.config, "r") as f:
+            config = yaml.safe_load(f) or {}
+        outbox = Outbox.from_config(config.get("delivery", {}).get("outbox", {}))
+        if not outbox:
+            print("The outbox is disabled")
+            return 1
+        print(f"Requeued {outbox.requeue_dead()} dead-lettered messages: {outbox.stats()}")
+        outbox.close()
+        return 0
+        
+    started = time.perf_counter()
+    agent = AIAlphaAgent(args.config, dry_run=command in ("dry-run", "bench") or getattr(args, "dry_run", False))
+    logger.info(f"Started in {(time.perf_counter() - started) * 1000:.0f} ms")
+    
+    if command == "run":
+        asyncio.run(run_agent(agent))
+    elif command == "run-once":
+        asyncio.run(run_once(agent))
+    elif command == "dry-run":
+        asyncio.run(dry_run(agent, args.save))
+    elif command == "bench":
+        asyncio.run(bench(agent, args.items, args.file))
+    elif command == "replay":
+        if args.dry_run:
+            asyncio.run(dry_run(agent, source=read_items(args.file)))
+        else:
+            asyncio.run(run_once(agent, read_items(args.file)))
+    return 0
+
 if __name__ == "__main__":
-    asyncio.run(run_agent()) 
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
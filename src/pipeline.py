@@ -0,0 +1,117 @@
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import time
+
+class Stage:
+    """One pipeline stage: an async handler run by a pool of workers."""
+    
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[Optional[Any]]],
+                 workers: int = 1, queue_size: int = 10,
+                 flush: Optional[Callable[[], Awaitable[List[Any]]]] = None):
+        """
+        Initialize the stage.
+        
+        Args:
+            name: Stage name used in logs and stats
+            handler: Coroutine taking one item; its result is passed to the next
+                stage, or dropped when it returns None
+            workers: Number of concurrent workers
+            queue_size: Capacity of the stage's input queue (backpressure)
+            flush: Optional coroutine called once the stage's input is drained;
+                the items it returns are passed to the next stage
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.flush = flush
+
+class Pipeline:
+    """Run items from an async source through stages connected by bounded queues."""
+    
+    def __init__(self, stages: List[Stage]):
+        """Initialize the pipeline with its ordered stages."""
+        self.stages = stages
+        self.logger = logging.getLogger(__name__)
+        
+    async def run(self, source: AsyncIterator[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Feed the source through every stage and drain cleanly.
+        
+        A full queue blocks the stage feeding it, so a slow stage throttles
+        everything upstream. Once the source is exhausted each stage is drained
+        in order before its workers are stopped. Handler and flush errors are
+        logged and do not stop the run; they are reported in the per-stage
+        counters returned ("failed" items, "flush_failed"), so the caller can
+        tell a clean run from one that lost items.
+        """
+        start = time.monotonic()
+        queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        stats = {
+            stage.name: {"received": 0, "emitted": 0, "failed": 0, "flush_failed": False, "busy_seconds": 0.0}
+            for stage in self.stages
+        }
+        
+        async def worker(index: int) -> None:
+            stage = self.stages[index]
+            counters = stats[stage.name]
+            while True:
+                item = await queues[index].get()
+                counters["received"] += 1
+                started = time.monotonic()
+                try:
+                    result = await stage.handler(item)
+                    if result is not None:
+                        counters["emitted"] += 1
+                        if index + 1 < len(queues):
+                            await queues[index + 1].put(result)
+                except Exception as e:
+                    counters["failed"] += 1
+                    self.logger.error(f"Error in stage '{stage.name}': {str(e)}")
+                finally:
+                    counters["busy_seconds"] += time.monotonic() - started
+                    queues[index].task_done()
+                    
+        workers = [
+            [asyncio.ensure_future(worker(i)) for _ in range(stage.workers)]
+            for i, stage in enumerate(self.stages)
+        ]
+        
+        try:
+            try:
+                async for item in source:
+                    await queues[0].put(item)
+            except Exception as e:
+                self.logger.error(f"Error in pipeline source: {str(e)}")
+                
+            for index, (queue, stage_workers) in enumerate(zip(queues, workers)):
+                await queue.join()
+                for task in stage_workers:
+                    task.cancel()
+                await self._flush(index, queues, stats)
+        finally:
+            for stage_workers in workers:
+                for task in stage_workers:
+                    task.cancel()
+            await asyncio.gather(*(task for stage_workers in workers for task in stage_workers),
+                                 return_exceptions=True)
+        
+        self.logger.info(f"Pipeline finished in {time.monotonic() - start:.1f}s: {stats}")
+        return stats
+        
+    async def _flush(self, index: int, queues: List[asyncio.Queue], stats: Dict[str, Dict[str, Any]]) -> None:
+        """Forward whatever a drained stage was holding back to the next stage."""
+        stage = self.stages[index]
+        if stage.flush is None:
+            return
+        try:
+            results = await stage.flush()
+        except Exception as e:
+            self.logger.error(f"Error flushing stage '{stage.name}': {str(e)}")
+            stats[stage.name]["flush_failed"] = True
+            return
+        stats[stage.name]["emitted"] += len(results)
+        if index + 1 < len(queues):
+            for result in results:
+                await queues[index + 1].put(result)
@@ -0,0 +1 @@
+"""Local persistent storage package."""
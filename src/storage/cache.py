@@ -0,0 +1,131 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+
+class SQLiteCache:
+    """Persistent key-value cache with TTL and size-based LRU eviction."""
+    
+    def __init__(self, path: str, namespace: str, ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: SQLite database file, created if missing
+            namespace: Logical partition so several caches can share one file
+            ttl_seconds: Entries older than this are treated as misses (None = no expiry)
+            max_entries: Least recently used entries beyond this count are evicted
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_lru ON cache (namespace, accessed_at)"
+        )
+        self.conn.commit()
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], namespace: str) -> Optional["SQLiteCache"]:
+        """Build a cache from a config section, or return None when it is disabled."""
+        if not config or not config.get("enabled", True):
+            return None
+        ttl_hours = config.get("ttl_hours")
+        return cls(
+            path=config.get("path", "data/cache.sqlite3"),
+            namespace=namespace,
+            ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+            max_entries=config.get("max_entries")
+        )
+        
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Hash the given parts into a stable content-addressed key."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        row = self.conn.execute(
+            "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+            (self.namespace, key)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+            self.misses += 1
+            return None
+        
+        self.conn.execute(
+            "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            (now, self.namespace, key)
+        )
+        self.conn.commit()
+        self.hits += 1
+        return json.loads(row[0])
+        
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, json.dumps(value), now, now)
+        )
+        self._evict(now)
+        self.conn.commit()
+        
+    def _evict(self, now: float) -> None:
+        """Drop expired entries and trim the namespace to max_entries."""
+        removed = 0
+        if self.ttl_seconds:
+            removed += self.conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND created_at < ?",
+                (self.namespace, now - self.ttl_seconds)
+            ).rowcount
+        if self.max_entries:
+            removed += self.conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries)
+            ).rowcount
+        if removed:
+            self.evictions += removed
+            self.logger.debug(f"Evicted {removed} entries from '{self.namespace}' cache")
+            
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this cache instance."""
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+        
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
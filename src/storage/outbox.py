@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+
+class Outbox:
+    """Durable queue of outgoing messages with retries and dead-lettering."""
+    
+    def __init__(self, path: str, max_attempts: int = 5, base_delay: float = 60,
+                 max_delay: float = 3600, lease_seconds: float = 600):
+        """
+        Initialize the outbox.
+        
+        Args:
+            path: SQLite database file, created if missing
+            max_attempts: Failed sends before a message is dead-lettered
+            base_delay: Seconds before the first retry; doubles on every attempt
+            max_delay: Upper bound on the retry delay in seconds
+            lease_seconds: How long a claimed message stays with its worker before
+                another one may claim it again
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        self.logger = logging.getLogger(__name__)
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode: claim() opens its own write transaction
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " idempotency_key TEXT NOT NULL UNIQUE,"
+            " recipient TEXT NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt_at REAL NOT NULL,"
+            " last_error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)")
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["Outbox"]:
+        """Build an outbox from a config section, or return None when it is disabled."""
+        if not config or not config.get("enabled", True):
+            return None
+        return cls(
+            path=config.get("path", "data/state.sqlite3"),
+            max_attempts=config.get("max_attempts", 5),
+            base_delay=config.get("base_delay", 60),
+            max_delay=config.get("max_delay", 3600),
+            lease_seconds=config.get("lease_seconds", 600)
+        )
+        
+    @staticmethod
+    def make_key(item_key: str, recipient: str) -> str:
+        """Idempotency key for delivering one item to one recipient."""
+        return hashlib.sha256(json.dumps([item_key, recipient]).encode("utf-8")).hexdigest()
+        
+    def enqueue(self, item_key: str, recipient: str, payload: Dict[str, Any]) -> bool:
+        """
+        Store a message for delivery.
+        
+        Returns False when a message for the same (item, recipient) was already
+        queued, sent or dead-lettered, so nothing is ever delivered twice.
+        """
+        now = time.time()
+        inserted = self.conn.execute(
+            "INSERT OR IGNORE INTO outbox (idempotency_key, recipient, payload, status, "
+            "next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, 'pending', ?, ?, ?)",
+            (self.make_key(item_key, recipient), recipient, json.dumps(payload, default=str), now, now, now)
+        ).rowcount
+        return bool(inserted)
+        
+    def claim(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Lease up to limit due messages to the caller and return them.
+        
+        While a message is 'sending', next_attempt_at holds its lease expiry. A
+        message whose lease expired (its worker crashed) is due again. Selecting
+        and leasing happen in one write transaction, so two workers never claim
+        the same message.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = self.conn.execute(
+                "SELECT id, recipient, payload, attempts FROM outbox "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+            self.conn.executemany(
+                "UPDATE outbox SET status = 'sending', next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                [(now + self.lease_seconds, now, row[0]) for row in rows]
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [
+            {"id": row[0], "recipient": row[1], "payload": json.loads(row[2]), "attempts": row[3]}
+            for row in rows
+        ]
+        
+    def mark_sent(self, message_id: int) -> None:
+        """Record a successful delivery."""
+        self.conn.execute(
+            "UPDATE outbox SET status = 'sent', attempts = attempts + 1, last_error = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (time.time(), message_id)
+        )
+        
+    def mark_failed(self, message_id: int, error: str) -> bool:
+        """
+        Record a failed delivery and schedule a retry with exponential backoff.
+        
+        Returns True when the message ran out of attempts and was dead-lettered.
+        """
+        row = self.conn.execute("SELECT attempts FROM outbox WHERE id = ?", (message_id,)).fetchone()
+        if row is None:
+            return False
+        attempts = row[0] + 1
+        now = time.time()
+        dead = attempts >= self.max_attempts
+        # Jitter spreads retries of messages that failed together
+        delay = min(self.base_delay * 2 ** (attempts - 1), self.max_delay) * random.uniform(0.8, 1.2)
+        self.conn.execute(
+            "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, "
+            "updated_at = ? WHERE id = ?",
+            ("dead" if dead else "pending", attempts, now + delay, error[:1000], now, message_id)
+        )
+        if dead:
+            self.logger.error(f"Dead-lettered outbox message {message_id} after {attempts} attempts: {error}")
+        return dead
+        
+    def requeue_dead(self) -> int:
+        """Give every dead-lettered message a fresh set of attempts."""
+        requeued = self.conn.execute(
+            "UPDATE outbox SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? "
+            "WHERE status = 'dead'",
+            (time.time(), time.time())
+        ).rowcount
+        return requeued
+        
+    def stats(self) -> Dict[str, int]:
+        """Number of messages per status."""
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+        
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
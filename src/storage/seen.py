@@ -0,0 +1,182 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import difflib
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+
+# Fields that carry a platform-native ID, in lookup order
+PLATFORM_ID_FIELDS = ("id", "objectID", "full_name")
+# Words compared when deciding whether content changed; bounds the diff cost
+MAX_COMPARE_WORDS = 2000
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so the same page always maps to the same key."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query)
+        if not key.lower().startswith("utm_") and key.lower() not in ("ref", "source")
+    ))
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme, host, path, query, ""))
+
+class SeenStore:
+    """Record items that have already been processed and delivered."""
+    
+    def __init__(self, path: str, retention_days: Optional[float] = 90, change_threshold: float = 0.3):
+        """
+        Initialize the seen-item store.
+        
+        Args:
+            path: SQLite database file, created if missing
+            retention_days: Records older than this are pruned (None = keep forever)
+            change_threshold: Fraction of changed content (0-1) at which a seen
+                item is processed again
+        """
+        self.retention_days = retention_days
+        self.change_threshold = change_threshold
+        self.logger = logging.getLogger(__name__)
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            " url TEXT PRIMARY KEY,"
+            " platform TEXT NOT NULL,"
+            " platform_id TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " content TEXT NOT NULL,"
+            " processed_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(seen)")}
+        if "link_url" not in columns:
+            # Stores created before link posts were tracked
+            self.conn.execute("ALTER TABLE seen ADD COLUMN link_url TEXT NOT NULL DEFAULT ''")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_platform ON seen (platform, platform_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_link ON seen (link_url)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_processed ON seen (processed_at)")
+        self.conn.commit()
+        
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["SeenStore"]:
+        """Build a store from a config section, or return None when it is disabled."""
+        if not config or not config.get("enabled", True):
+            return None
+        return cls(
+            path=config.get("path", "data/state.sqlite3"),
+            retention_days=config.get("retention_days", 90),
+            change_threshold=config.get("change_threshold", 0.3)
+        )
+        
+    def _keys(self, item: Dict[str, Any]) -> Dict[str, str]:
+        """Canonical URL, linked URL (of a link post) and platform ID for an item."""
+        platform_id = next((str(item[f]) for f in PLATFORM_ID_FIELDS if item.get(f)), "")
+        return {
+            "url": canonical_url(item.get("url", "")),
+            "link_url": canonical_url(item.get("link_url", "")),
+            "platform": str(item.get("platform", "")),
+            "platform_id": platform_id
+        }
+        
+    def _content(self, item: Dict[str, Any]) -> str:
+        """Text used to detect significant content changes."""
+        return " ".join(str(item.get(field) or "") for field in ("title", "text", "readme"))
+        
+    def _lookup(self, keys: Dict[str, str]) -> Optional[tuple]:
+        """Find a stored record by platform ID, else by either of its URLs or a record's linked URL."""
+        row = None
+        if keys["platform_id"]:
+            row = self.conn.execute(
+                "SELECT content_hash, content, platform, platform_id FROM seen "
+                "WHERE platform = ? AND platform_id = ?",
+                (keys["platform"], keys["platform_id"])
+            ).fetchone()
+        urls = [url for url in (keys["url"], keys["link_url"]) if url]
+        if row is None and urls:
+            marks = ", ".join("?" * len(urls))
+            row = self.conn.execute(
+                "SELECT content_hash, content, platform, platform_id FROM seen "
+                f"WHERE url IN ({marks}) OR link_url IN ({marks})", urls + urls
+            ).fetchone()
+        return row
+        
+    def is_new(self, item: Dict[str, Any]) -> bool:
+        """
+        Whether an item was never processed, or its content changed significantly since.
+        
+        Content is only compared with the record of the same platform and ID. A
+        record found by URL from another platform or ID (e.g. an HN post linking
+        a delivered repo) means the idea was already processed.
+        """
+        keys = self._keys(item)
+        if not keys["url"] and not keys["link_url"] and not keys["platform_id"]:
+            return True
+        row = self._lookup(keys)
+        if row is None:
+            return True
+        if (row[2], row[3]) != (keys["platform"], keys["platform_id"]):
+            return False
+        
+        content = self._content(item)
+        if hashlib.sha256(content.encode("utf-8")).hexdigest() == row[0]:
+            return False
+        return 1 - self._similarity(row[1], content) >= self.change_threshold
+        
+    @staticmethod
+    def _similarity(old: str, new: str) -> float:
+        """Fraction (0-1) of the two texts' leading words that match in order."""
+        old_words = old.split()[:MAX_COMPARE_WORDS]
+        new_words = new.split()[:MAX_COMPARE_WORDS]
+        return difflib.SequenceMatcher(None, old_words, new_words, autojunk=False).ratio()
+        
+    def filter_unseen(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep only items that still need processing."""
+        unseen = [item for item in items if self.is_new(item)]
+        if len(unseen) < len(items):
+            self.logger.info(f"Skipped {len(items) - len(unseen)} already processed items")
+        return unseen
+        
+    def mark_processed(self, item: Dict[str, Any]) -> None:
+        """Record an item as processed with its current content."""
+        keys = self._keys(item)
+        content = self._content(item)
+        url = keys["url"] or f"{keys['platform']}:{keys['platform_id']}"
+        owner = self.conn.execute("SELECT platform, platform_id FROM seen WHERE url = ?", (url,)).fetchone()
+        if owner and tuple(owner) != (keys["platform"], keys["platform_id"]) and keys["platform_id"]:
+            # Another platform's record owns the URL; keep it and key this one by platform ID
+            url = f"{keys['platform']}:{keys['platform_id']}"
+        self.conn.execute(
+            "DELETE FROM seen WHERE platform = ? AND platform_id = ? AND platform_id != ''",
+            (keys["platform"], keys["platform_id"])
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO seen (url, link_url, platform, platform_id, content_hash, content, processed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, keys["link_url"], keys["platform"], keys["platform_id"],
+             hashlib.sha256(content.encode("utf-8")).hexdigest(), content, time.time())
+        )
+        self.conn.commit()
+        
+    def prune(self) -> int:
+        """Delete records older than the retention period and return how many were removed."""
+        if not self.retention_days:
+            return 0
+        removed = self.conn.execute(
+            "DELETE FROM seen WHERE processed_at < ?",
+            (time.time() - self.retention_days * 86400,)
+        ).rowcount
+        self.conn.commit()
+        return removed
+        
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
@@ -0,0 +1,61 @@
+from typing import Any, Dict, List, Optional
+import json
+import os
+import sqlite3
+import time
+
+class CursorStore:
+    """Persist per-source collection high-water marks between runs."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the cursor store.
+        
+        Args:
+            path: SQLite database file, created if missing
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            " source TEXT NOT NULL,"
+            " target TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " ids TEXT NOT NULL,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (source, target))"
+        )
+        self.conn.commit()
+        
+    def get(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """Return {"value": high-water mark, "ids": IDs seen at that mark}, or None."""
+        row = self.conn.execute(
+            "SELECT value, ids FROM cursors WHERE source = ? AND target = ?",
+            (source, target)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"value": json.loads(row[0]), "ids": json.loads(row[1])}
+        
+    def set(self, source: str, target: str, value: Any, ids: List[str]) -> None:
+        """Store the high-water mark for a source target."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cursors (source, target, value, ids, updated_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (source, target, json.dumps(value), json.dumps(sorted(ids)), time.time())
+        )
+        self.conn.commit()
+        
+    def reset(self, source: Optional[str] = None) -> None:
+        """Forget cursors for one source, or for all sources."""
+        if source is None:
+            self.conn.execute("DELETE FROM cursors")
+        else:
+            self.conn.execute("DELETE FROM cursors WHERE source = ?", (source,))
+        self.conn.commit()
+        
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self.conn.close()
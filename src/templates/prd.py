@@ -1,18 +1,66 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Iterable
+import asyncio
+import logging
 import yaml
 from datetime import datetime
-from llama_index.llms.openai import OpenAI
+from ..clients.registry import get_clients
+from ..clients.ratelimit import estimate_tokens
+from ..clients.responses import parse_json
 
 class PRDGenerator:
     """Generate Product Requirements Documents from content."""
     
-    def __init__(self, template_path: str):
-        """Initialize the PRD generator."""
+    # Template placeholder -> section name passed to the LLM
+    SECTIONS = {
+        "overview": "Overview",
+        "problem_statement": "Problem Statement",
+        "solution": "Proposed Solution",
+        "features": "Key Features",
+        "technical_requirements": "Technical Requirements",
+        "market_analysis": "Market Analysis",
+        "timeline": "Implementation Timeline",
+        "resources": "Resources Required",
+        "metrics": "Success Metrics",
+    }
+    
+    # Bump when prompts change so cached output is not reused across prompt revisions
+    PROMPT_VERSION = "1"
+    MODEL = "gpt-4o-mini"
+    
+    def __init__(self, template_path: str, config: Optional[Dict[str, Any]] = None, cache=None, clients=None):
+        """
+        Initialize the PRD generator.
+        
+        Args:
+            template_path: Path to the templates configuration
+            config: Optional generation settings (mode, max_concurrency, section_timeout,
+                structured_timeout)
+            cache: Optional SQLiteCache for generated sections and whole PRDs
+            clients: Optional ClientRegistry; the process-wide one by default
+        """
         with open(template_path, 'r') as f:
             templates = yaml.safe_load(f)
         self.template = templates["prd_template"]
-        self.llm = OpenAI(model="gpt-4o-mini")
+        self.config = config or {}
+        self.cache = cache
+        self.logger = logging.getLogger(__name__)
+        self.clients = clients or get_clients()
         
+    @property
+    def llm(self):
+        """Generation LLM, created on first use and shared with other components."""
+        return self.clients.llm(self.MODEL)
+        
+    async def _complete(self, prompt: str, completion_tokens: int, timeout: Optional[float] = None) -> Any:
+        """
+        Run one completion within the model's shared rate limit.
+        
+        The timeout applies to each attempt, not to time spent waiting for quota.
+        """
+        limiter = self.clients.limiter("openai", self.MODEL)
+        return await limiter.run(lambda: asyncio.wait_for(self.llm.acomplete(prompt), timeout),
+                                 estimate_tokens(prompt, completion=completion_tokens))
+                                 
     async def generate_section(self, content: Dict[str, Any], section: str) -> str:
         """Generate a specific section of the PRD using LLM."""
         prompt = f"""
@@ -27,22 +75,147 @@ class PRDGenerator:
         Generate the {section} section:
         """
         
-        response = await self.llm.acomplete(prompt)
+        response = await self._complete(prompt, 800, self.config.get("section_timeout", 60))
         return response.text.strip()
         
+    def _cache_key(self, content: Dict[str, Any], section: str) -> str:
+        """Content-addressed cache key for a section (or "*" for the whole PRD)."""
+        return self.cache.make_key(
+            content.get('title', ''),
+            content.get('text', ''),
+            content.get('readme', ''),
+            section,
+            self.PROMPT_VERSION,
+            self.MODEL
+        )
+        
+    async def _generate_section_cached(self, content: Dict[str, Any], section: str) -> str:
+        """Generate a section, serving it from the cache when the content is unchanged."""
+        if self.cache is None:
+            return await self.generate_section(content, section)
+            
+        key = self._cache_key(content, section)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        text = await self.generate_section(content, section)
+        if text:
+            self.cache.set(key, text)
+        return text
+        
+    async def _generate_section_safe(self, content: Dict[str, Any], section: str,
+                                     semaphore: asyncio.Semaphore) -> Optional[str]:
+        """Generate a section under the concurrency limit, returning None on failure."""
+        timeout = self.config.get("section_timeout", 60)
+        async with semaphore:
+            try:
+                # section_timeout bounds each attempt inside _complete, not the wait for quota
+                return await self._generate_section_cached(content, section)
+            except asyncio.TimeoutError:
+                self.logger.error(f"Timed out generating '{section}' section after {timeout}s")
+            except Exception as e:
+                self.logger.error(f"Error generating '{section}' section: {str(e)}")
+        return None
+        
+    def _placeholder(self, section: str) -> str:
+        """Placeholder text for a section that could not be generated."""
+        return f"_The {section} section could not be generated._"
+        
+    async def _generate_sections_sequential(self, content: Dict[str, Any]) -> Dict[str, str]:
+        """Generate all sections one after another."""
+        return {
+            key: await self._generate_section_cached(content, section)
+            for key, section in self.SECTIONS.items()
+        }
+        
+    async def _generate_sections_concurrent(self, content: Dict[str, Any],
+                                            keys: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        """Generate sections concurrently with a bounded number of in-flight requests."""
+        keys = list(keys) if keys is not None else list(self.SECTIONS)
+        semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 9))
+        results = await asyncio.gather(*(
+            self._generate_section_safe(content, self.SECTIONS[key], semaphore)
+            for key in keys
+        ))
+        return dict(zip(keys, results))
+        
+    async def _generate_sections_structured(self, content: Dict[str, Any]) -> Dict[str, Optional[str]]:
+        """Generate all sections in a single LLM call, re-requesting only invalid sections."""
+        section_list = "\n".join(f'        - "{key}": {name}' for key, name in self.SECTIONS.items())
+        prompt = f"""
+        Based on the following content about an AI agent idea, write a PRD.
+        Make every section detailed, professional, and actionable.
+        
+        Content:
+        Title: {content.get('title', '')}
+        Text: {content.get('text', '')}
+        URL: {content.get('url', '')}
+        
+        Return only a JSON object with exactly these keys, each mapped to the markdown text of that section:
+{section_list}
+        """
+        
+        generated = {}
+        try:
+            timeout = self.config.get("structured_timeout", self.config.get("section_timeout", 60) * 2)
+            response = await self._complete(prompt, 800 * len(self.SECTIONS), timeout)
+            generated = self._validate_sections(parse_json(response.text))
+            if self.cache is not None:
+                for key, text in generated.items():
+                    self.cache.set(self._cache_key(content, self.SECTIONS[key]), text)
+        except Exception as e:
+            self.logger.error(f"Error generating structured PRD: {str(e)}")
+            
+        missing = [key for key in self.SECTIONS if key not in generated]
+        if missing:
+            self.logger.info(f"Re-requesting {len(missing)} PRD section(s): {', '.join(missing)}")
+            generated.update(await self._generate_sections_concurrent(content, missing))
+        return {key: generated[key] for key in self.SECTIONS}
+        
+    def _validate_sections(self, data: Any) -> Dict[str, str]:
+        """Keep only the schema keys whose value is a non-empty string."""
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+        return {
+            key: data[key].strip()
+            for key in self.SECTIONS
+            if isinstance(data.get(key), str) and data[key].strip()
+        }
+        
     async def generate_prd(self, content: Dict[str, Any]) -> str:
-        """Generate a complete PRD from the content."""
+        """
+        Generate a complete PRD from the content.
+        
+        Sections that failed are replaced by a placeholder. Raises RuntimeError
+        when no section could be generated (e.g. during a provider outage), so
+        the item is retried instead of delivered as placeholders.
+        """
+        prd_key = self._cache_key(content, "*") if self.cache is not None else None
+        generated = self.cache.get(prd_key) if prd_key else None
+        
+        if generated is None:
+            mode = self.config.get("mode", "concurrent")
+            if mode == "sequential":
+                generated = await self._generate_sections_sequential(content)
+            elif mode == "structured":
+                generated = await self._generate_sections_structured(content)
+            else:
+                generated = await self._generate_sections_concurrent(content)
+                
+            if not any(generated.values()):
+                raise RuntimeError(f"No PRD section could be generated for '{content.get('title', 'Untitled')}'")
+            # Only cache complete PRDs so failed sections are retried next time
+            if prd_key and all(generated.values()):
+                self.cache.set(prd_key, generated)
+                
+        generated = {
+            key: text or self._placeholder(self.SECTIONS[key])
+            for key, text in generated.items()
+        }
+            
         sections = {
             "title": content.get("title", "Untitled AI Agent Concept"),
-            "overview": await self.generate_section(content, "Overview"),
-            "problem_statement": await self.generate_section(content, "Problem Statement"),
-            "solution": await self.generate_section(content, "Proposed Solution"),
-            "features": await self.generate_section(content, "Key Features"),
-            "technical_requirements": await self.generate_section(content, "Technical Requirements"),
-            "market_analysis": await self.generate_section(content, "Market Analysis"),
-            "timeline": await self.generate_section(content, "Implementation Timeline"),
-            "resources": await self.generate_section(content, "Resources Required"),
-            "metrics": await self.generate_section(content, "Success Metrics"),
+            **generated,
             "source_url": content.get("url", ""),
             "platform": content.get("platform", "Unknown"),
             "date": datetime.now().strftime("%Y-%m-%d")
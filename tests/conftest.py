@@ -0,0 +1,56 @@
+"""Make the src package importable however pytest is started, and share test doubles."""
+import inspect
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.clients.ratelimit import RateLimiter
+
+class FakeClients:
+    """
+    Client registry whose LLM answers every prompt with respond(prompt).
+    
+    respond returns the completion text and may raise, or be a coroutine
+    function to simulate slow requests. Agents answer chats the same way.
+    Every prompt is recorded, and every agent built.
+    """
+    
+    def __init__(self, respond=lambda prompt: "Section text", limiter=None):
+        self.respond = respond
+        self.prompts = []
+        self.agents = []
+        self._limiter = limiter or RateLimiter("openai/test")
+        
+    def limiter(self, provider, model="default"):
+        return self._limiter
+        
+    def llm(self, model):
+        clients = self
+        
+        class LLM:
+            async def acomplete(self, prompt):
+                clients.prompts.append(prompt)
+                text = clients.respond(prompt)
+                if inspect.isawaitable(text):
+                    text = await text
+                return type("Response", (), {"text": text})()
+        return LLM()
+        
+    def agent(self, actions, system_prompt, **kwargs):
+        clients = self
+        
+        class Agent:
+            async def achat(self, prompt):
+                return type("Response", (), {"response": await clients.llm("agent").acomplete(prompt)})()
+                
+        agent = Agent()
+        self.agents.append(agent)
+        return agent
+
+@pytest.fixture
+def fake_clients():
+    """Build a FakeClients registry: fake_clients(respond, limiter=None)."""
+    return FakeClients
@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from src.storage.cache import SQLiteCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache; advance by adding to clock[0]."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+def make_cache(tmp_path, **kwargs):
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="test", **kwargs)
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("a", {"value": 1})
+    clock[0] += 59
+    assert cache.get("a") == {"value": 1}
+    
+    clock[0] += 2
+    assert cache.get("a") is None
+    # Reading does not extend the TTL, and the next write sweeps the expired row
+    cache.set("b", 2)
+    assert cache.stats()["evictions"] == 1
+
+def test_eviction_drops_the_least_recently_used_entry(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("a", 1)
+    clock[0] += 1
+    cache.set("b", 2)
+    clock[0] += 1
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    clock[0] += 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+def test_namespaces_share_a_file_without_sharing_entries(tmp_path):
+    prds = make_cache(tmp_path)
+    scores = SQLiteCache(str(tmp_path / "cache.sqlite3"), namespace="scores", max_entries=1)
+    prds.set("a", "prd")
+    scores.set("a", 0.9)
+    scores.set("b", 0.8)
+    assert prds.get("a") == "prd"
+    assert scores.get("a") is None
+
+def test_stats_count_hits_misses_and_evictions(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=1)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    clock[0] += 1
+    cache.set("b", 2)
+    cache.get("a")
+    
+    assert cache.stats() == {"namespace": "test", "hits": 1, "misses": 2, "evictions": 1, "hit_rate": 1 / 3}
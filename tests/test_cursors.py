@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from src.collectors.base import BaseCollector
+from src.collectors.github import GitHubCollector
+from src.collectors.hackernews import HackerNewsCollector
+from src.collectors.reddit import RedditCollector
+from src.storage.state import CursorStore
+
+class Collector(BaseCollector):
+    name = "test"
+    cursor_field = "created_utc"
+    
+    async def collect(self):
+        return []
+        
+    async def filter_content(self, content):
+        return content
+
+def post(item_id, created):
+    return {"id": item_id, "created_utc": created}
+
+def make_collector(tmp_path):
+    store = CursorStore(str(tmp_path / "state.sqlite3"))
+    return Collector({}, cursor_store=store, clients=object()), store
+
+def test_mark_advances_only_on_commit(tmp_path):
+    collector, store = make_collector(tmp_path)
+    assert len(collector.filter_new("t", [post("a", 1), post("b", 2)])) == 2
+    assert store.get("test", "t") is None
+    
+    collector.commit_cursors()
+    assert store.get("test", "t") == {"value": 2, "ids": ["b"]}
+    assert collector.filter_new("t", [post("a", 1), post("b", 2), post("c", 2), post("d", 3)]) == [
+        post("c", 2), post("d", 3)
+    ]
+
+def test_discarded_collection_is_collected_again(tmp_path):
+    collector, store = make_collector(tmp_path)
+    collector.filter_new("t", [post("a", 1)])
+    collector.discard_cursors()
+    collector.commit_cursors()
+    assert store.get("test", "t") is None
+    assert collector.filter_new("t", [post("a", 1)]) == [post("a", 1)]
+
+def test_mark_stays_below_held_back_items(tmp_path):
+    collector, store = make_collector(tmp_path)
+    collector.filter_new("t", [post("a", 1), post("b", 2), post("c", 3)])
+    collector.hold_back(post("b", 2))
+    collector.commit_cursors()
+    
+    # "b" and everything after it are collected again; "a" is not
+    assert collector.filter_new("t", [post("a", 1), post("b", 2), post("c", 3)]) == [
+        post("b", 2), post("c", 3)
+    ]
+
+def test_post_below_the_score_filter_is_collected_again(tmp_path):
+    store = CursorStore(str(tmp_path / "state.sqlite3"))
+    reddit = RedditCollector({"subreddits": [], "keywords": [], "min_score": 10}, cursor_store=store, clients=object())
+    
+    fresh = {"id": "p1", "created_utc": time.time() - 3600, "score": 2}
+    new = reddit.filter_new("r", [fresh])
+    assert not asyncio.run(reddit.admit(new[0]))
+    reddit.commit_cursors()
+    
+    popular = dict(fresh, score=500)
+    assert reddit.filter_new("r", [popular]) == [popular]
+    assert asyncio.run(reddit.admit(popular))
+
+def test_old_post_below_the_score_filter_lets_the_mark_advance(tmp_path):
+    store = CursorStore(str(tmp_path / "state.sqlite3"))
+    reddit = RedditCollector({"subreddits": [], "keywords": [], "min_score": 10, "recheck_hours": 24},
+                             cursor_store=store, clients=object())
+    
+    stale = {"id": "p1", "created_utc": time.time() - 48 * 3600, "score": 2}
+    assert not asyncio.run(reddit.admit(reddit.filter_new("r", [stale])[0]))
+    reddit.commit_cursors()
+    assert store.get("reddit", "r") == {"value": stale["created_utc"], "ids": ["p1"]}
+
+def test_ineligible_repo_does_not_pin_the_mark(tmp_path):
+    store = CursorStore(str(tmp_path / "state.sqlite3"))
+    github = GitHubCollector({"min_stars": 100}, cursor_store=store, clients=object())
+    
+    undescribed = {"full_name": "a/old", "updated_at": "2026-01-01T00:00:00Z", "stars": 500,
+                   "text": "", "readme": "docs"}
+    good = {"full_name": "b/new", "updated_at": "2026-01-02T00:00:00Z", "stars": 500,
+            "text": "An agent", "readme": "docs"}
+    for repo in github.filter_new("q", [undescribed, good]):
+        asyncio.run(github.admit(repo))
+    github.commit_cursors()
+    
+    assert store.get("github", "q") == {"value": good["updated_at"], "ids": ["b/new"]}
+    assert github.filter_new("q", [undescribed, good]) == []
+
+def test_hackernews_keeps_no_high_water_mark(tmp_path):
+    store = CursorStore(str(tmp_path / "state.sqlite3"))
+    hn = HackerNewsCollector({"keywords": [], "min_points": 5}, cursor_store=store, clients=object())
+    
+    older = {"objectID": "1", "created_at_i": 100}
+    hn.filter_new("k", [{"objectID": "2", "created_at_i": 200}])
+    hn.commit_cursors()
+    assert hn.filter_new("k", [older]) == [older]
@@ -0,0 +1,89 @@
+import random
+
+from src.analysis.dedup import Deduplicator
+from src.analysis.ranking import rank_key
+from src.storage.seen import canonical_url
+
+README = "A framework for building autonomous agents. " * 40
+
+def hn_post(points=50):
+    return {"title": "Show HN: bar, an agent framework", "text": "", "points": points,
+            "platform": "HackerNews", "url": "https://github.com/foo/bar"}
+
+def repo(stars=5000):
+    return {"title": "foo/bar", "text": "Agent framework", "readme": README, "stars": stars,
+            "platform": "GitHub", "url": "https://github.com/foo/bar/"}
+
+def test_add_keeps_first_of_each_cluster():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    first = hn_post()
+    assert dedup.add(first) is first
+    assert dedup.add(repo()) is None
+    other = {"title": "Unrelated", "text": "Something else entirely", "url": "https://example.org/x"}
+    assert dedup.add(other) is other
+
+def test_richer_duplicate_replaces_kept_content_in_place():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    kept = dedup.add(hn_post(points=50))
+    dedup.add(repo(stars=5000))
+    
+    # The dict already passed downstream now carries the repository
+    assert kept["platform"] == "GitHub"
+    assert kept["readme"] == README
+    assert kept["engagement"] == 5050
+    assert [source["platform"] for source in kept["sources"]] == ["HackerNews", "GitHub"]
+
+def test_kept_item_lists_every_member_with_its_own_content():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    kept = dedup.add(hn_post())
+    dedup.add(repo())
+    
+    platforms = [member["platform"] for member in kept["members"]]
+    assert platforms == ["HackerNews", "GitHub"]
+    assert kept["members"][0] == hn_post()
+
+def test_poorer_duplicate_only_adds_engagement():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    kept = dedup.add(repo(stars=5000))
+    assert dedup.add(hn_post(points=50)) is None
+    assert kept["platform"] == "GitHub"
+    assert kept["engagement"] == 5050
+
+def test_rank_key_uses_merged_engagement():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    merged = dedup.add(repo(stars=100))
+    dedup.add(hn_post(points=900))
+    single = {"title": "Another", "stars": 500, "relevance_score": 0.8}
+    merged["relevance_score"] = 0.8
+    assert rank_key(merged) > rank_key(single)
+
+def test_near_duplicate_text_is_merged():
+    dedup = Deduplicator({})
+    text = ("AgentKit is an open source framework for building autonomous agents. Agents plan multi step tasks, "
+            "call external tools through a typed interface, keep long term memory in a vector store, and report "
+            "progress to a dashboard. It ships with examples for coding, research and browser automation, "
+            "supports several model providers, and runs locally or in the cloud with a single command.")
+    kept = dedup.add({"title": "AgentKit", "text": text, "url": "https://a.example/1"})
+    assert dedup.add({"title": "AgentKit", "text": text + " Now with memory.", "url": "https://b.example/2"}) is None
+    assert len(kept["members"]) == 2
+
+def test_tables_find_every_hash_within_max_distance():
+    rng = random.Random(0)
+    for max_distance in (3, 8):
+        dedup = Deduplicator({"max_distance": max_distance})
+        for _ in range(300):
+            fp = rng.getrandbits(64)
+            near = fp
+            for bit in rng.sample(range(64), rng.randint(0, max_distance)):
+                near ^= 1 << bit
+            assert set(dedup._table_keys(fp)) & set(dedup._table_keys(near))
+
+def reddit_link_post():
+    return {"title": "Found a neat agent library", "text": "", "score": 40, "platform": "Reddit",
+            "url": "https://reddit.com/r/LocalLLaMA/comments/abc", "link_url": "https://www.github.com/foo/bar"}
+
+def test_link_post_matches_on_its_linked_url():
+    dedup = Deduplicator({}, canonicalize=canonical_url)
+    kept = dedup.add(reddit_link_post())
+    assert dedup.add(repo()) is None
+    assert [member["platform"] for member in kept["members"]] == ["Reddit", "GitHub"]
@@ -0,0 +1,161 @@
+import asyncio
+import email
+import email.policy
+import mailbox
+import re
+import smtplib
+import socket
+import time
+from pathlib import Path
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from src.delivery.gmail import GmailDelivery
+from src.delivery.maildir import MaildirDelivery
+from src.delivery.smtp import SMTPDelivery
+
+TEMPLATES = str(Path(__file__).resolve().parent.parent / "config" / "templates.yaml")
+
+def opportunities(count):
+    return [({"title": f"Agent idea {n}", "text": "An autonomous agent", "url": f"https://x.org/{n}",
+              "relevance_score": 0.8}, f"# PRD {n}") for n in range(count)]
+
+class Recorder:
+    """aiosmtpd handler keeping every message and the session it arrived on."""
+    
+    def __init__(self):
+        self.messages = []
+        self.sessions = []
+        
+    async def handle_DATA(self, server, session, envelope):
+        if not any(seen is session for seen in self.sessions):
+            self.sessions.append(session)
+        self.messages.append(email.message_from_bytes(envelope.content, policy=email.policy.default))
+        return "250 OK"
+
+@pytest.fixture
+def smtp_server():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    recorder = Recorder()
+    controller = Controller(recorder, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield recorder, port
+    controller.stop()
+
+@pytest.fixture
+def recipient(monkeypatch):
+    monkeypatch.setenv("EMAIL_RECIPIENT", "team@example.org")
+    monkeypatch.delenv("SMTP_USERNAME", raising=False)
+    monkeypatch.delenv("SMTP_PASSWORD", raising=False)
+
+def smtp(port):
+    return SMTPDelivery(TEMPLATES, {"host": "127.0.0.1", "port": port, "starttls": False, "timeout": 5})
+
+def test_send_many_uses_one_connection(smtp_server, recipient):
+    recorder, port = smtp_server
+    started = time.perf_counter()
+    results = asyncio.run(smtp(port).send_many(opportunities(50)))
+    elapsed = time.perf_counter() - started
+    
+    assert results == [True] * 50
+    assert len(recorder.messages) == 50
+    assert len(recorder.sessions) == 1
+    assert recorder.messages[0]["To"] == "team@example.org"
+    # A local server takes well under a second for the whole batch over one connection
+    assert elapsed < 5
+
+def test_digest_attaches_one_prd_per_item(smtp_server, recipient):
+    recorder, port = smtp_server
+    assert asyncio.run(smtp(port).send_digest(opportunities(3)))
+    
+    message = recorder.messages[0]
+    attachments = {part.get_filename(): part.get_content() for part in message.iter_attachments()}
+    assert sorted(attachments) == ["prd_1_agent-idea-0.md", "prd_2_agent-idea-1.md", "prd_3_agent-idea-2.md"]
+    assert attachments["prd_2_agent-idea-1.md"].strip() == "# PRD 1"
+
+def test_missing_recipient_fails_the_send(smtp_server, recipient, monkeypatch):
+    recorder, port = smtp_server
+    monkeypatch.delenv("EMAIL_RECIPIENT")
+    delivery = smtp(port)
+    
+    assert asyncio.run(delivery.send_many(opportunities(2))) == [False, False]
+    assert not asyncio.run(delivery.send_digest(opportunities(2)))
+    assert recorder.messages == []
+
+def test_unreachable_server_fails_the_batch(recipient):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    assert asyncio.run(smtp(port).send_many(opportunities(2))) == [False, False]
+
+def test_dropped_connection_keeps_messages_already_sent(smtp_server, recipient, monkeypatch):
+    recorder, port = smtp_server
+    send_message = smtplib.SMTP.send_message
+    calls = []
+    
+    def flaky_send(self, message, *args, **kwargs):
+        calls.append(message)
+        if len(calls) == 3:
+            raise TimeoutError("timed out")
+        return send_message(self, message, *args, **kwargs)
+        
+    monkeypatch.setattr(smtplib.SMTP, "send_message", flaky_send)
+    assert asyncio.run(smtp(port).send_many(opportunities(4))) == [True, True, False, False]
+    assert len(recorder.messages) == 2
+
+def test_maildir_writes_one_message_per_item(tmp_path, recipient):
+    path = tmp_path / "maildir"
+    delivery = MaildirDelivery(TEMPLATES, {"path": str(path)})
+    assert asyncio.run(delivery.send_many(opportunities(3))) == [True] * 3
+    assert asyncio.run(delivery.send_digest(opportunities(2)))
+    
+    messages = list(mailbox.Maildir(str(path), create=False))
+    assert len(messages) == 4
+    digest = next(m for m in messages if m["Subject"].startswith("AI Opportunity Alert"))
+    assert len([part for part in digest.walk() if part.get_filename()]) == 2
+
+def test_gmail_agent_sends_run_concurrently_on_their_own_agents(fake_clients, recipient):
+    in_flight = []
+    peak = []
+    
+    async def respond(prompt):
+        in_flight.append(prompt)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.02)
+        in_flight.remove(prompt)
+        return "sent"
+        
+    clients = fake_clients(respond)
+    delivery = GmailDelivery(None, TEMPLATES, execution="agent", max_concurrent_sends=3, clients=clients)
+    assert asyncio.run(delivery.send_many(opportunities(6))) == [True] * 6
+    assert max(peak) == 3
+    assert len(clients.agents) == 6
+
+def test_gmail_agent_digest_attaches_prds_by_file_path(fake_clients, recipient):
+    attached = []
+    
+    def respond(prompt):
+        path = re.search(r"'attachment': '([^']+)'", prompt).group(1)
+        attached.append(Path(path).read_text())
+        return "sent"
+        
+    clients = fake_clients(respond)
+    delivery = GmailDelivery(None, TEMPLATES, execution="agent", clients=clients)
+    assert asyncio.run(delivery.send_digest(opportunities(3)))
+    
+    assert "# PRD" not in clients.prompts[0]
+    assert all(f"# PRD {n}" in attached[0] for n in range(3))
+
+def test_gmail_send_that_hangs_times_out_and_fails(fake_clients, recipient):
+    async def hang(prompt):
+        await asyncio.sleep(3600)
+        
+    delivery = GmailDelivery(None, TEMPLATES, execution="agent", max_concurrent_sends=1,
+                             send_timeout=0.05, clients=fake_clients(hang))
+    started = time.perf_counter()
+    assert asyncio.run(delivery.send_many(opportunities(2))) == [False, False]
+    # The hung send released its slot, so the second send got its own attempt
+    assert time.perf_counter() - started < 1
@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+
+from src.analysis.filter import ContentFilter
+
+def posts(count):
+    return [{"title": f"AI agent framework {n}", "text": "An autonomous LLM agent that plans and calls tools",
+             "score": 50, "created_utc": time.time()} for n in range(count)]
+
+def make_filter(fake_clients, responder, **cascade):
+    clients = fake_clients(responder)
+    config = {"cascade": {"top_k": 100, "uncertainty_band": [0, 1], **cascade}, "max_batch_size": 5}
+    return ContentFilter(config, clients=clients), clients
+
+def scores(prompt):
+    ids = [item["id"] for item in json.loads(prompt.split("(JSON):")[1].split("\n")[1])]
+    return json.dumps([{"id": i, "technical_score": 8, "practical_score": 8, "timeliness_score": 8,
+                        "quality_score": 8, "final_score": 0.8} for i in ids])
+
+def test_batches_share_one_request(fake_clients):
+    content_filter, clients = make_filter(fake_clients, scores)
+    selected = asyncio.run(content_filter.score_cascade(posts(20)))
+    assert len(clients.prompts) == 4
+    assert all(post["relevance_tier"] == "llm" for post in selected)
+
+def test_retries_after_an_invalid_response_count_against_max_llm_calls(fake_clients):
+    content_filter, clients = make_filter(fake_clients, lambda prompt: "not json", max_llm_calls=2)
+    asyncio.run(content_filter.score_cascade(posts(40)))
+    assert len(clients.prompts) == 2
+    assert content_filter.llm_calls_used == 2
+
+def test_token_budget_covers_the_whole_prompt_and_completion(fake_clients):
+    content_filter, clients = make_filter(fake_clients, lambda prompt: "not json", max_llm_tokens=3000)
+    asyncio.run(content_filter.score_cascade(posts(40)))
+    
+    # Every request was charged in full, template and completion included
+    charged = sum(len(prompt) // 4 for prompt in clients.prompts)
+    assert content_filter.llm_tokens_used > charged
+    assert content_filter.llm_tokens_used <= 3000
+
+def test_batch_api_scores_in_input_order(fake_clients):
+    content_filter, clients = make_filter(fake_clients, scores)
+    items = posts(7)
+    items[3]["created_utc"] = time.time() - 365 * 86400
+    result = asyncio.run(content_filter.analyze_relevance_batch(items))
+    assert result == [0.8, 0.8, 0.8, 0.0, 0.8, 0.8, 0.8]
+    assert len(clients.prompts) == 2
+
+async def hang(prompt):
+    await asyncio.sleep(3600)
+
+def test_each_scoring_attempt_times_out(fake_clients):
+    clients = fake_clients(hang)
+    content_filter = ContentFilter({"request_timeout": 0.05, "max_batch_size": 5}, clients=clients)
+    started = time.monotonic()
+    result = asyncio.run(content_filter.analyze_relevance_batch(posts(3)))
+    assert result == [0.0, 0.0, 0.0]
+    # One batch request, then one retry per item, each cut off by the timeout
+    assert len(clients.prompts) == 4
+    assert time.monotonic() - started < 5
+
+def test_title_bonus_survives_lowercasing_that_changes_length(fake_clients):
+    content_filter = ContentFilter({}, clients=fake_clients())
+    assert content_filter._calculate_relevance({"title": "An İstanbul ai agent", "text": ""}) == \
+        content_filter._calculate_relevance({"title": "An Istanbul ai agent", "text": ""})
+    assert content_filter._calculate_relevance({"title": "An Istanbul", "text": "an ai agent"}) < \
+        content_filter._calculate_relevance({"title": "An İstanbul ai agent", "text": ""})
+
+def test_cascade_drops_stale_posts_before_scoring(fake_clients):
+    content_filter, clients = make_filter(fake_clients, scores)
+    stale_hn = {"title": "AI agent framework", "text": "An autonomous LLM agent", "points": 500,
+                "created_at_i": time.time() - 5 * 365 * 86400}
+    stale_reddit = dict(posts(1)[0], created_utc=time.time() - 60 * 86400)
+    fresh = posts(1)[0]
+    
+    selected = asyncio.run(content_filter.score_cascade([stale_hn, stale_reddit, fresh]))
+    assert selected == [fresh]
+    # Only the fresh post was sent to the LLM
+    assert len(clients.prompts) == 1
+    assert len(json.loads(scores(clients.prompts[0]))) == 1
@@ -0,0 +1,58 @@
+import time
+
+from src.storage.outbox import Outbox
+
+def make_outbox(tmp_path, **kwargs):
+    return Outbox(str(tmp_path / "state.sqlite3"), **kwargs)
+
+def test_enqueue_is_idempotent(tmp_path):
+    outbox = make_outbox(tmp_path)
+    assert outbox.enqueue("item", "a@example.org", {"kind": "item"})
+    assert not outbox.enqueue("item", "a@example.org", {"kind": "item"})
+    assert outbox.enqueue("item", "b@example.org", {"kind": "item"})
+    assert outbox.stats() == {"pending": 2}
+
+def test_claimed_message_is_not_claimed_twice(tmp_path):
+    first = make_outbox(tmp_path)
+    second = make_outbox(tmp_path)
+    first.enqueue("item", "a@example.org", {"kind": "item"})
+    
+    claimed = first.claim()
+    assert [m["payload"] for m in claimed] == [{"kind": "item"}]
+    assert second.claim() == []
+    # Opening the outbox again must not steal a live lease
+    assert make_outbox(tmp_path).claim() == []
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    outbox = make_outbox(tmp_path, lease_seconds=0)
+    outbox.enqueue("item", "a@example.org", {"kind": "item"})
+    message_id = outbox.claim()[0]["id"]
+    
+    assert [m["id"] for m in outbox.claim()] == [message_id]
+
+def test_failed_message_backs_off_then_dead_letters(tmp_path):
+    outbox = make_outbox(tmp_path, max_attempts=2, base_delay=100)
+    outbox.enqueue("item", "a@example.org", {"kind": "item"})
+    message_id = outbox.claim()[0]["id"]
+    
+    assert not outbox.mark_failed(message_id, "smtp down")
+    next_attempt = outbox.conn.execute(
+        "SELECT next_attempt_at FROM outbox WHERE id = ?", (message_id,)
+    ).fetchone()[0]
+    assert 80 <= next_attempt - time.time() <= 120
+    assert outbox.claim() == []
+    
+    outbox.conn.execute("UPDATE outbox SET next_attempt_at = 0")
+    assert outbox.claim()[0]["attempts"] == 1
+    assert outbox.mark_failed(message_id, "smtp down")
+    assert outbox.stats() == {"dead": 1}
+    
+    assert outbox.requeue_dead() == 1
+    assert outbox.claim()[0]["attempts"] == 0
+
+def test_sent_message_is_not_claimed_again(tmp_path):
+    outbox = make_outbox(tmp_path)
+    outbox.enqueue("item", "a@example.org", {"kind": "item"})
+    outbox.mark_sent(outbox.claim()[0]["id"])
+    assert outbox.claim() == []
+    assert outbox.stats() == {"sent": 1}
@@ -0,0 +1,92 @@
+import asyncio
+
+from src.pipeline import Pipeline, Stage
+
+async def items(values):
+    for value in values:
+        yield value
+
+def test_items_flow_through_every_stage():
+    seen = []
+    
+    async def double(item):
+        return item * 2
+        
+    async def collect(item):
+        seen.append(item)
+        
+    stats = asyncio.run(Pipeline([Stage("double", double, workers=3, queue_size=2),
+                                  Stage("collect", collect)]).run(items(range(20))))
+    assert sorted(seen) == [n * 2 for n in range(20)]
+    assert stats["double"]["received"] == stats["double"]["emitted"] == 20
+    assert stats["collect"]["received"] == 20 and stats["collect"]["emitted"] == 0
+
+def test_stage_is_drained_before_its_flush_and_the_next_flush():
+    events = []
+    held = []
+    
+    async def hold(item):
+        await asyncio.sleep(0.001)
+        events.append(("hold", item))
+        held.append(item)
+        
+    async def release():
+        events.append(("flush", "hold"))
+        return sorted(held, reverse=True)
+        
+    async def last(item):
+        events.append(("last", item))
+        
+    async def finish():
+        events.append(("flush", "last"))
+        return []
+        
+    stats = asyncio.run(Pipeline([Stage("hold", hold, workers=2, flush=release),
+                                  Stage("last", last, flush=finish)]).run(items(range(5))))
+                                  
+    flush_at = events.index(("flush", "hold"))
+    assert all(name == "hold" for name, _ in events[:flush_at])
+    # Flushed items are forwarded to the next stage, whose flush runs last
+    assert events[flush_at + 1:] == [("last", n) for n in (4, 3, 2, 1, 0)] + [("flush", "last")]
+    assert stats["hold"]["emitted"] == 5
+
+def test_failing_items_are_counted_and_do_not_stop_the_run():
+    seen = []
+    
+    async def check(item):
+        if item % 3 == 0:
+            raise ValueError("bad item")
+        return item
+        
+    async def collect(item):
+        seen.append(item)
+        
+    stats = asyncio.run(Pipeline([Stage("check", check, workers=2), Stage("collect", collect)]).run(items(range(9))))
+    assert stats["check"]["failed"] == 3
+    assert stats["check"]["emitted"] == 6
+    assert sorted(seen) == [1, 2, 4, 5, 7, 8]
+
+def test_failing_source_still_drains_what_it_produced():
+    seen = []
+    
+    async def broken():
+        yield 1
+        yield 2
+        raise ConnectionError("source went away")
+        
+    async def collect(item):
+        seen.append(item)
+        
+    asyncio.run(Pipeline([Stage("collect", collect)]).run(broken()))
+    assert seen == [1, 2]
+
+def test_flush_failure_is_reported():
+    async def hold(item):
+        return None
+        
+    async def broken():
+        raise RuntimeError("selection failed")
+        
+    stats = asyncio.run(Pipeline([Stage("hold", hold, flush=broken)]).run(items(range(3))))
+    assert stats["hold"]["flush_failed"]
+    assert stats["hold"]["failed"] == 0
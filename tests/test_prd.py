@@ -0,0 +1,48 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from src.templates.prd import PRDGenerator
+
+TEMPLATES = str(Path(__file__).resolve().parent.parent / "config" / "templates.yaml")
+
+def failing_sections(*sections):
+    """LLM that fails the named sections and writes every other one."""
+    def respond(prompt):
+        if any(section in prompt for section in sections):
+            raise ConnectionError("provider outage")
+        return "Section text"
+    return respond
+
+def test_prd_with_no_generated_section_raises(fake_clients):
+    clients = fake_clients(failing_sections(*PRDGenerator.SECTIONS.values()))
+    generator = PRDGenerator(TEMPLATES, clients=clients)
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.generate_prd({"title": "t"}))
+
+def test_prd_keeps_placeholders_for_some_failed_sections(fake_clients):
+    generator = PRDGenerator(TEMPLATES, clients=fake_clients(failing_sections("Market Analysis")))
+    prd = asyncio.run(generator.generate_prd({"title": "t"}))
+    assert prd.count("Section text") == len(PRDGenerator.SECTIONS) - 1
+    assert "The Market Analysis section could not be generated" in prd
+
+def test_structured_mode_re_requests_only_missing_sections(fake_clients):
+    missing = ["market_analysis", "metrics"]
+    
+    def respond(prompt):
+        if "Return only a JSON object" in prompt:
+            return json.dumps({key: f"Structured {key}" if key != "metrics" else " "
+                               for key in PRDGenerator.SECTIONS if key != "market_analysis"})
+        return "Section text"
+        
+    clients = fake_clients(respond)
+    generator = PRDGenerator(TEMPLATES, {"mode": "structured"}, clients=clients)
+    prd = asyncio.run(generator.generate_prd({"title": "t"}))
+    
+    section_prompts = clients.prompts[1:]
+    assert len(section_prompts) == 2
+    assert all(any(PRDGenerator.SECTIONS[key] in prompt for prompt in section_prompts) for key in missing)
+    assert prd.count("Section text") == 2
+    assert "Structured overview" in prd
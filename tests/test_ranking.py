@@ -0,0 +1,26 @@
+import random
+
+from src.analysis.ranking import engagement, rank_key, top_k
+
+def item(name, score, stars=0):
+    return {"title": name, "relevance_score": score, "stars": stars}
+
+def test_top_k_keeps_the_best_k_best_first():
+    items = [item(str(n), n / 100) for n in range(100)]
+    random.Random(0).shuffle(items)
+    assert [i["title"] for i in top_k(items, 3)] == ["99", "98", "97"]
+
+def test_late_best_item_is_selected():
+    # Three strong items arrive before the best one
+    items = [item("a", 0.9), item("b", 0.92), item("c", 0.95), item("best", 1.0), item("weak", 0.2)]
+    assert [i["title"] for i in top_k(items, 3)] == ["best", "c", "b"]
+
+def test_engagement_breaks_score_ties():
+    popular, quiet = item("popular", 0.8, stars=900), item("quiet", 0.8, stars=3)
+    assert rank_key(popular) > rank_key(quiet)
+    assert top_k([quiet, popular], 1) == [popular]
+
+def test_merged_engagement_wins_over_platform_count():
+    merged = dict(item("merged", 0.8, stars=10), engagement=5000)
+    assert engagement(merged) == 5000
+    assert top_k([item("single", 0.8, stars=900), merged], 1) == [merged]
@@ -0,0 +1,122 @@
+import asyncio
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+import pytest
+
+from src.clients.ratelimit import RateLimiter, parse_duration, rate_limit_info, retry_after
+from src.templates.prd import PRDGenerator
+
+TEMPLATES = str(Path(__file__).resolve().parent.parent / "config" / "templates.yaml")
+
+class RateLimitError(Exception):
+    def __init__(self, headers=None):
+        super().__init__("429 Too Many Requests")
+        self.response = type("Response", (), {"status_code": 429, "headers": headers or {}})()
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0), ("6m0s", 360.0), ("20ms", 0.02), ("0.5", 0.5), ("1h2m3s", 3723.0), ("", None), (None, None),
+])
+def test_parse_duration(value, seconds):
+    if seconds is None:
+        assert parse_duration(value) is None
+    else:
+        assert parse_duration(value) == pytest.approx(seconds)
+
+def test_retry_after_prefers_milliseconds():
+    assert retry_after({"retry-after-ms": "250", "retry-after": "9"}) == pytest.approx(0.25)
+    assert retry_after({"retry-after": "9"}) == 9.0
+    assert retry_after({"retry-after": "-3"}) == 0.0
+    assert retry_after({}) is None
+    assert retry_after({"retry-after": "soon"}) is None
+
+def test_retry_after_http_date():
+    assert 25 <= retry_after({"retry-after": formatdate(time.time() + 30, usegmt=True)}) <= 30
+
+def test_rate_limit_info_recognizes_only_rate_limits():
+    headers, delay = rate_limit_info(RateLimitError({"Retry-After": "2"}))
+    assert headers == {"retry-after": "2"} and delay == 2.0
+    assert rate_limit_info(ValueError("bad request")) is None
+    assert rate_limit_info(asyncio.TimeoutError()) is None
+
+def test_run_retries_rate_limits_and_slows_down():
+    limiter = RateLimiter("test", max_retries=2, base_delay=0.001)
+    attempts = []
+    
+    async def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError({"retry-after-ms": "1"})
+        return "ok"
+        
+    assert asyncio.run(limiter.run(call)) == "ok"
+    assert len(attempts) == 3
+    assert limiter.stats()["rate_limited"] == 2
+    assert limiter.scale < 1.0
+
+def test_a_burst_of_rate_limit_errors_decreases_the_rate_once():
+    limiter = RateLimiter("test", max_retries=0)
+    
+    async def limited():
+        await asyncio.sleep(0.01)
+        raise RateLimitError({"retry-after": "1"})
+        
+    async def burst():
+        return await asyncio.gather(*(limiter.run(limited) for _ in range(6)), return_exceptions=True)
+        
+    assert all(isinstance(result, RateLimitError) for result in asyncio.run(burst()))
+    assert limiter.stats()["rate_limited"] == 6
+    assert limiter.scale == 0.5
+
+def test_run_gives_up_after_max_retries_and_never_retries_other_errors():
+    limiter = RateLimiter("test", max_retries=1, base_delay=0.001)
+    attempts = []
+    
+    async def limited():
+        attempts.append(1)
+        raise RateLimitError({"retry-after-ms": "1"})
+        
+    async def broken():
+        attempts.append(1)
+        raise ValueError("bad request")
+        
+    with pytest.raises(RateLimitError):
+        asyncio.run(limiter.run(limited))
+    assert len(attempts) == 2
+    
+    attempts.clear()
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.run(broken))
+    assert len(attempts) == 1
+
+def test_acquire_waits_for_an_empty_bucket():
+    limiter = RateLimiter("test", requests_per_minute=600)
+    limiter.requests.level = 0
+    
+    started = time.monotonic()
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - started >= 0.09
+    assert limiter.stats()["requests"] == 1
+
+def blocked_limiter(wait: float) -> RateLimiter:
+    """Quota that takes a while to free up."""
+    limiter = RateLimiter("openai/test")
+    limiter.blocked_until = time.monotonic() + wait
+    return limiter
+
+def test_section_timeout_does_not_count_waiting_for_quota(fake_clients):
+    clients = fake_clients(limiter=blocked_limiter(0.2))
+    generator = PRDGenerator(TEMPLATES, {"section_timeout": 0.05}, clients=clients)
+    prd = asyncio.run(generator.generate_prd({"title": "t"}))
+    assert prd.count("Section text") == len(PRDGenerator.SECTIONS)
+
+def test_section_timeout_bounds_each_attempt(fake_clients):
+    async def slow(prompt):
+        await asyncio.sleep(1)
+        
+    generator = PRDGenerator(TEMPLATES, {"section_timeout": 0.05}, clients=fake_clients(slow))
+    started = time.monotonic()
+    with pytest.raises(RuntimeError):
+        asyncio.run(generator.generate_prd({"title": "t"}))
+    assert time.monotonic() - started < 0.5
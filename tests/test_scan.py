@@ -0,0 +1,69 @@
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.main import AIAlphaAgent
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def reddit_post(**fields):
+    return {"id": "p1", "title": "An open source AI agent framework", "selftext": "Agents that call tools",
+            "permalink": "/r/agents/comments/p1", "score": 50, "created_utc": time.time() - 3600, **fields}
+
+@pytest.fixture
+def make_agent(tmp_path, monkeypatch, fake_clients):
+    """Agent over one Reddit target returning the given posts, delivering to a Maildir."""
+    # The agent reads its templates relative to the repository root
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setenv("EMAIL_RECIPIENT", "team@example.org")
+    
+    def make(posts, cascade=False):
+        config = {
+            "reddit": {"subreddits": ["agents"], "keywords": ["agent"], "min_score": 10, "execution": "direct"},
+            "filters": {"max_repos_per_batch": 3, "cascade": cascade or {"enabled": False}},
+            "state": {"path": str(tmp_path / "state.sqlite3"), "seen": {"path": str(tmp_path / "state.sqlite3")}},
+            "delivery": {"backend": "maildir", "mode": "per_item", "outbox": {"enabled": False},
+                         "maildir": {"path": str(tmp_path / "maildir")}},
+        }
+        path = tmp_path / "sources.yaml"
+        path.write_text(yaml.safe_dump(config))
+        agent = AIAlphaAgent(str(path))
+        clients = fake_clients()
+        agent.content_filter.clients = clients
+        agent.prd_generator.clients = clients
+        
+        async def execute_action(action, params):
+            return {"children": [{"kind": "t3", "data": dict(post)} for post in posts]}
+            
+        agent.collectors["reddit"].execute_action = execute_action
+        return agent
+    return make
+
+def test_clean_run_advances_the_cursor(make_agent, tmp_path):
+    agent = make_agent([reddit_post()])
+    asyncio.run(agent.scan_and_process())
+    
+    assert agent.cursor_store.get("reddit", "agents")["ids"] == ["p1"]
+    assert len(list((tmp_path / "maildir" / "new").iterdir())) == 1
+
+def test_failed_selection_keeps_the_cursor(make_agent):
+    agent = make_agent([reddit_post()], cascade={"enabled": True})
+    
+    async def broken_cascade(items):
+        raise RuntimeError("scoring failed")
+        
+    agent.content_filter.score_cascade = broken_cascade
+    asyncio.run(agent.scan_and_process())
+    
+    assert agent.cursor_store.get("reddit", "agents") is None
+
+def test_link_post_without_selftext_is_scored_and_delivered(make_agent, tmp_path):
+    agent = make_agent([reddit_post(selftext=None)],
+                       cascade={"enabled": True, "max_llm_calls": 0, "min_score": 0})
+    asyncio.run(agent.scan_and_process())
+    
+    assert agent.cursor_store.get("reddit", "agents")["ids"] == ["p1"]
+    assert len(list((tmp_path / "maildir" / "new").iterdir())) == 1
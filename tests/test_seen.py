@@ -0,0 +1,82 @@
+import random
+
+from src.storage.seen import SeenStore
+
+README = " ".join(["This project provides a framework for building autonomous agents "
+                   "that plan tasks, call tools and remember past work."] * 20)
+
+def repo(readme=README):
+    return {"title": "foo/bar", "text": "Agent framework", "readme": readme,
+            "platform": "GitHub", "full_name": "foo/bar", "url": "https://github.com/foo/bar"}
+
+def hn_post():
+    return {"title": "Show HN: foo/bar, an agent framework", "text": "", "points": 120,
+            "platform": "HackerNews", "objectID": "4242", "url": "https://github.com/foo/bar"}
+
+def make_store(tmp_path):
+    return SeenStore(str(tmp_path / "state.sqlite3"), change_threshold=0.3)
+
+def test_unseen_item_is_new(tmp_path):
+    assert make_store(tmp_path).is_new(repo())
+
+def test_processed_item_is_not_new(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    assert not store.is_new(repo())
+    # Found again through the platform ID under a different URL
+    assert not store.is_new(dict(repo(), url="https://github.com/foo/bar?utm_source=x"))
+
+def test_same_link_from_another_platform_is_not_new(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    assert not store.is_new(hn_post())
+
+def test_records_sharing_a_url_keep_their_own_change_checks(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    store.mark_processed(hn_post())
+    assert not store.is_new(repo())
+    assert not store.is_new(hn_post())
+    rewritten = " ".join(["A database migration tool with a command line interface."] * 20)
+    assert store.is_new(repo(rewritten))
+
+def test_small_edit_is_not_a_significant_change(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    assert not store.is_new(repo(README + " Added a badge."))
+
+def test_rewritten_readme_is_a_significant_change(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    # Similar letters throughout, so a character-multiset bound (quick_ratio) stays high
+    rewritten = " ".join(["Our library lets developers orchestrate language model workers "
+                          "which coordinate through shared memory and message queues."] * 20)
+    assert store.is_new(repo(rewritten))
+
+def test_reordered_content_is_a_significant_change(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(repo())
+    # Same characters in a different order: a multiset comparison would call this unchanged
+    characters = list(README)
+    random.Random(0).shuffle(characters)
+    assert store.is_new(repo("".join(characters)))
+
+def test_prune_removes_old_records(tmp_path):
+    store = SeenStore(str(tmp_path / "state.sqlite3"), retention_days=1)
+    store.mark_processed(repo())
+    store.conn.execute("UPDATE seen SET processed_at = processed_at - 2 * 86400")
+    assert store.prune() == 1
+    assert store.is_new(repo())
+
+def reddit_link_post():
+    return {"title": "Found a neat agent library", "text": "", "platform": "Reddit", "id": "abc",
+            "url": "https://reddit.com/r/LocalLLaMA/comments/abc", "link_url": "https://github.com/foo/bar"}
+
+def test_link_post_and_linked_repo_are_seen_through_each_other(tmp_path):
+    store = make_store(tmp_path)
+    store.mark_processed(reddit_link_post())
+    assert not store.is_new(repo())
+    
+    other = SeenStore(str(tmp_path / "other.sqlite3"))
+    other.mark_processed(repo())
+    assert not other.is_new(reddit_link_post())
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.analysis.filter import SemanticScorer
+
+AGENT_POST = "An open source framework for building autonomous AI agents that call tools"
+
+def test_score_does_not_drift_with_scored_volume():
+    scorer = SemanticScorer({})
+    before = scorer.score([AGENT_POST])
+    
+    # Many posts sharing the same vocabulary used to shrink its IDF batch after batch
+    for _ in range(50):
+        scorer.score([f"{AGENT_POST} release {n}" for n in range(20)])
+        
+    assert np.allclose(scorer.score([AGENT_POST]), before)
+
+def test_score_is_independent_of_batch():
+    scorer = SemanticScorer({})
+    alone = scorer.score([AGENT_POST])[0]
+    batched = scorer.score(["A recipe for sourdough bread", AGENT_POST])[1]
+    assert np.isclose(alone, batched)
+
+def test_relevant_text_outscores_unrelated_text():
+    scorer = SemanticScorer({})
+    relevant, unrelated = scorer.score([AGENT_POST, "A recipe for sourdough bread"])
+    assert relevant > unrelated
+    assert 0.0 <= unrelated <= relevant <= 1.0
+
+def test_chunked_scoring_matches_one_pass():
+    texts = [f"{AGENT_POST} {n}" if n % 3 else f"A recipe for sourdough bread {n}" for n in range(50)]
+    chunked = SemanticScorer({"chunk_size": 7}).score(texts)
+    whole = SemanticScorer({"chunk_size": 1000}).score(texts)
+    assert chunked.shape == (50,)
+    assert np.allclose(chunked, whole)
+    assert SemanticScorer({}).score([]).shape == (0,)
@@ -0,0 +1,128 @@
+import asyncio
+
+from src.collectors.github import GitHubCollector
+from src.collectors.orchestrator import SourceOrchestrator
+from src.collectors.reddit import RedditCollector
+
+class CountingSource:
+    def __init__(self, count):
+        self.config = {}
+        self.count = count
+        self.target_count = 0
+        self.failed_targets = []
+        
+    def reset_targets(self):
+        pass
+        
+    async def stream(self):
+        for n in range(self.count):
+            yield {"id": n}
+
+def test_orchestrator_queue_is_bounded():
+    orchestrator = SourceOrchestrator({"a": CountingSource(50), "b": CountingSource(50)}, {"queue_size": 3})
+    
+    async def consume():
+        received = 0
+        async for _ in orchestrator.stream():
+            received += 1
+            # Producers run ahead of a slow consumer by at most the queue size
+            produced = sum(timing["items"] for timing in orchestrator.timings.values())
+            assert produced - received <= 3 + len(orchestrator.collectors)
+            await asyncio.sleep(0)
+        return received
+        
+    assert asyncio.run(consume()) == 100
+    assert sorted(orchestrator.completed()) == ["a", "b"]
+
+def make_github(count):
+    collector = GitHubCollector({"queue_size": 2}, clients=object())
+    
+    async def search(query):
+        return [{"full_name": f"{query}/{n}", "url": "", "title": "", "updated_at": ""} for n in range(count)]
+        
+    async def readme(full_name, updated_at):
+        return "README"
+        
+    collector._search_query = search
+    collector._fetch_readme_cached = readme
+    return collector
+
+def test_github_stream_yields_every_repo_through_a_bounded_queue():
+    async def consume():
+        return [repo async for repo in make_github(20).stream()]
+        
+    repos = asyncio.run(consume())
+    assert len(repos) == 20 * len(GitHubCollector.SEARCH_QUERIES)
+    assert all(repo["readme"] == "README" for repo in repos)
+
+def test_github_stream_stops_cleanly_with_a_full_queue():
+    async def consume():
+        stream = make_github(20).stream()
+        first = await stream.__anext__()
+        await asyncio.sleep(0.01)  # let the producer fill the queue
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return first, pending
+        
+    first, pending = asyncio.run(consume())
+    assert first["readme"] == "README"
+    assert pending == []
+
+def make_reddit(failing):
+    collector = RedditCollector({"subreddits": ["a", "b", "c"]}, clients=object())
+    
+    async def fetch(subreddit):
+        if subreddit in failing:
+            raise RuntimeError("unavailable")
+        return [{"id": subreddit}]
+        
+    collector._collect_subreddit = fetch
+    return collector
+
+def test_orchestrator_records_failed_targets():
+    orchestrator = SourceOrchestrator({"partial": make_reddit({"b"}), "down": make_reddit({"a", "b", "c"})}, {})
+    
+    async def consume():
+        return [item async for item in orchestrator.stream()]
+        
+    assert len(asyncio.run(consume())) == 2
+    assert orchestrator.timings["partial"]["failed_targets"] == ["b"]
+    assert sorted(orchestrator.timings["down"]["failed_targets"]) == ["a", "b", "c"]
+    # A source whose every target failed did not complete, so its cursors stay put
+    assert orchestrator.completed() == ["partial"]
+    
+    # The counts start over with each run
+    orchestrator.collectors["down"]._collect_subreddit = orchestrator.collectors["partial"]._collect_subreddit
+    asyncio.run(consume())
+    assert orchestrator.timings["down"]["failed_targets"] == ["b"]
+    assert sorted(orchestrator.completed()) == ["down", "partial"]
+
+def test_github_direct_search_tolerates_null_fields():
+    collector = GitHubCollector({"execution": "direct", "min_stars": 100}, clients=object())
+    
+    async def execute_action(action, params):
+        return {"items": [{"name": "bare", "full_name": "o/bare", "stargazers_count": 500,
+                           "description": None, "language": None, "topics": None}]}
+        
+    collector.execute_action = execute_action
+    repos = asyncio.run(collector._search_query("agents"))
+    assert repos[0]["text"] == "" and repos[0]["language"] == "" and repos[0]["topics"] == []
+    repos[0]["readme"] = "README"
+    assert asyncio.run(collector.filter_content(repos)) == []
+
+def test_reddit_link_post_keeps_its_linked_url():
+    collector = RedditCollector({"subreddits": ["a"], "keywords": ["agent"], "execution": "direct"}, clients=object())
+    
+    async def execute_action(action, params):
+        return {"children": [
+            {"kind": "t3", "data": {"id": "1", "title": "An agent library", "selftext": None,
+                                    "permalink": "/r/a/comments/1", "url": "https://github.com/foo/bar"}},
+            {"kind": "t3", "data": {"id": "2", "title": "Agent question", "selftext": "How?",
+                                    "permalink": "/r/a/comments/2", "url": "https://www.reddit.com/r/a/comments/2"}},
+        ]}
+        
+    collector.execute_action = execute_action
+    link, text = asyncio.run(collector._collect_subreddit("a"))
+    assert (link["url"], link["link_url"]) == ("https://reddit.com/r/a/comments/1", "https://github.com/foo/bar")
+    assert text["link_url"] == ""